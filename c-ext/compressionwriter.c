@@ -74,6 +74,7 @@ static PyObject *ZstdCompressionWriter_write(ZstdCompressionWriter *self,
     ZSTD_inBuffer input;
     PyObject *res;
     Py_ssize_t totalWrite = 0;
+    ZSTD_EndDirective endOp = ZSTD_e_continue;
 
     if (!PyArg_ParseTupleAndKeywords(args, kwargs, "y*:write", kwlist,
                                      &source)) {
@@ -82,18 +83,39 @@ static PyObject *ZstdCompressionWriter_write(ZstdCompressionWriter *self,
 
     if (self->closed) {
         PyErr_SetString(PyExc_ValueError, "stream is closed");
-        return NULL;
+        goto finally;
+    }
+
+    /* Nothing to feed the compressor. */
+    if (!source.len) {
+        result = PyLong_FromLong(0);
+        goto finally;
+    }
+
+    if (self->frameEnded) {
+        PyErr_SetString(ZstdError, "zstd compress error: Src size is incorrect");
+        goto finally;
+    }
+
+    /* If a single write provides all of the pledged input, end the frame
+     * now. This allows zstd to compress directly from the source buffer
+     * instead of staging input in its internal buffer first. */
+    if (self->sourceSize == (unsigned long long)source.len) {
+        endOp = ZSTD_e_end;
     }
 
+    self->sourceSize = ZSTD_CONTENTSIZE_UNKNOWN;
+
     self->output.pos = 0;
 
     input.src = source.buf;
     input.size = source.len;
     input.pos = 0;
 
-    while (input.pos < (size_t)source.len) {
+    while (input.pos < input.size ||
+           (ZSTD_e_end == endOp && !self->frameEnded)) {
         Py_BEGIN_ALLOW_THREADS zresult = ZSTD_compressStream2(
-            self->compressor->cctx, &self->output, &input, ZSTD_e_continue);
+            self->compressor->cctx, &self->output, &input, endOp);
         Py_END_ALLOW_THREADS
 
             if (ZSTD_isError(zresult)) {
@@ -114,6 +136,10 @@ static PyObject *ZstdCompressionWriter_write(ZstdCompressionWriter *self,
             self->bytesCompressed += self->output.pos;
         }
         self->output.pos = 0;
+
+        if (ZSTD_e_end == endOp && 0 == zresult) {
+            self->frameEnded = 1;
+        }
     }
 
     if (self->writeReturnRead) {
@@ -167,7 +193,8 @@ static PyObject *ZstdCompressionWriter_flush(ZstdCompressionWriter *self,
     input.size = 0;
     input.pos = 0;
 
-    while (1) {
+    /* If write() already ended the frame, there is nothing to flush. */
+    while (!self->frameEnded) {
         Py_BEGIN_ALLOW_THREADS zresult = ZSTD_compressStream2(
             self->compressor->cctx, &self->output, &input, flush);
         Py_END_ALLOW_THREADS
@@ -197,6 +224,12 @@ static PyObject *ZstdCompressionWriter_flush(ZstdCompressionWriter *self,
         }
     }
 
+    /* The pledged size only applies to the first frame. */
+    if (ZSTD_e_end == flush) {
+        self->frameEnded = 0;
+        self->sourceSize = ZSTD_CONTENTSIZE_UNKNOWN;
+    }
+
     if (!self->closing && PyObject_HasAttrString(self->writer, "flush")) {
         res = PyObject_CallMethod(self->writer, "flush", NULL);
         if (NULL == res) {
@@ -10,15 +10,15 @@
 
 extern PyObject *ZstdError;
 
-int setup_cctx(ZstdCompressor *compressor) {
+static int configure_cctx(ZstdCompressor *compressor, ZSTD_CCtx *cctx) {
     size_t zresult;
 
     assert(compressor);
-    assert(compressor->cctx);
+    assert(cctx);
     assert(compressor->params);
 
-    zresult = ZSTD_CCtx_setParametersUsingCCtxParams(compressor->cctx,
-                                                     compressor->params);
+    zresult =
+        ZSTD_CCtx_setParametersUsingCCtxParams(cctx, compressor->params);
     if (ZSTD_isError(zresult)) {
         PyErr_Format(ZstdError, "could not set compression parameters: %s",
                      ZSTD_getErrorName(zresult));
@@ -27,12 +27,11 @@ int setup_cctx(ZstdCompressor *compressor) {
 
     if (compressor->dict) {
         if (compressor->dict->cdict) {
-            zresult =
-                ZSTD_CCtx_refCDict(compressor->cctx, compressor->dict->cdict);
+            zresult = ZSTD_CCtx_refCDict(cctx, compressor->dict->cdict);
         }
         else {
             zresult = ZSTD_CCtx_loadDictionary_advanced(
-                compressor->cctx, compressor->dict->dictData,
+                cctx, compressor->dict->dictData,
                 compressor->dict->dictSize, ZSTD_dlm_byRef,
                 compressor->dict->dictType);
         }
@@ -46,6 +45,13 @@ int setup_cctx(ZstdCompressor *compressor) {
     return 0;
 }
 
+int setup_cctx(ZstdCompressor *compressor) {
+    assert(compressor);
+    assert(compressor->cctx);
+
+    return configure_cctx(compressor, compressor->cctx);
+}
+
 static PyObject *frame_progression(ZSTD_CCtx *cctx) {
     PyObject *result = NULL;
     PyObject *value;
@@ -129,6 +135,7 @@ static int ZstdCompressor_init(ZstdCompressor *self, PyObject *args,
         PyErr_NoMemory();
         return -1;
     }
+    self->cctxInUse = 0;
 
     /* TODO stuff the original parameters away somewhere so we can reset later.
        This will allow us to do things like automatically adjust cparams based
@@ -481,13 +488,37 @@ static PyObject *ZstdCompressor_compress(ZstdCompressor *self, PyObject *args,
     size_t zresult;
     ZSTD_outBuffer outBuffer;
     ZSTD_inBuffer inBuffer;
+    ZSTD_CCtx *cctx = self->cctx;
+    ZSTD_CCtx *tempCCtx = NULL;
+    int acquired = 0;
 
     if (!PyArg_ParseTupleAndKeywords(args, kwargs, "y*|O:compress", kwlist,
                                      &source)) {
         return NULL;
     }
 
-    ZSTD_CCtx_reset(self->cctx, ZSTD_reset_session_only);
+    /* Another thread may be in the middle of compress() on this instance with
+       the GIL released. Rather than clobber its context, compress with a
+       temporary context configured identically. */
+    if (self->cctxInUse) {
+        tempCCtx = ZSTD_createCCtx();
+        if (!tempCCtx) {
+            PyErr_NoMemory();
+            goto finally;
+        }
+
+        if (configure_cctx(self, tempCCtx)) {
+            goto finally;
+        }
+
+        cctx = tempCCtx;
+    }
+    else {
+        self->cctxInUse = 1;
+        acquired = 1;
+    }
+
+    ZSTD_CCtx_reset(cctx, ZSTD_reset_session_only);
 
     destSize = ZSTD_compressBound(source.len);
     output = PyBytes_FromStringAndSize(NULL, destSize);
@@ -495,7 +526,7 @@ static PyObject *ZstdCompressor_compress(ZstdCompressor *self, PyObject *args,
         goto finally;
     }
 
-    zresult = ZSTD_CCtx_setPledgedSrcSize(self->cctx, source.len);
+    zresult = ZSTD_CCtx_setPledgedSrcSize(cctx, source.len);
     if (ZSTD_isError(zresult)) {
         PyErr_Format(ZstdError, "error setting source size: %s",
                      ZSTD_getErrorName(zresult));
@@ -516,7 +547,7 @@ static PyObject *ZstdCompressor_compress(ZstdCompressor *self, PyObject *args,
                 size. This means the argument to ZstdCompressor to control frame
                 parameters is honored. */
         zresult =
-            ZSTD_compressStream2(self->cctx, &outBuffer, &inBuffer, ZSTD_e_end);
+            ZSTD_compressStream2(cctx, &outBuffer, &inBuffer, ZSTD_e_end);
     Py_END_ALLOW_THREADS
 
         if (ZSTD_isError(zresult)) {
@@ -534,6 +565,12 @@ static PyObject *ZstdCompressor_compress(ZstdCompressor *self, PyObject *args,
     Py_SET_SIZE(output, outBuffer.pos);
 
 finally:
+    if (acquired) {
+        self->cctxInUse = 0;
+    }
+    if (tempCCtx) {
+        ZSTD_freeCCtx(tempCCtx);
+    }
     PyBuffer_Release(&source);
     return output;
 }
@@ -687,6 +724,13 @@ static ZstdCompressionWriter *ZstdCompressor_stream_writer(ZstdCompressor *self,
         return NULL;
     }
 
+    /* When the input size is known, the output can never exceed its
+       compression bound. Don't allocate more than that. */
+    if (sourceSize != ZSTD_CONTENTSIZE_UNKNOWN && sourceSize < outSize &&
+        ZSTD_compressBound((size_t)sourceSize) < outSize) {
+        outSize = ZSTD_compressBound((size_t)sourceSize);
+    }
+
     result = (ZstdCompressionWriter *)PyObject_CallObject(
         (PyObject *)&ZstdCompressionWriterType, NULL);
     if (!result) {
@@ -713,6 +757,8 @@ static ZstdCompressionWriter *ZstdCompressor_stream_writer(ZstdCompressor *self,
     Py_INCREF(result->writer);
 
     result->outSize = outSize;
+    result->sourceSize = sourceSize;
+    result->frameEnded = 0;
     result->bytesCompressed = 0;
     result->writeReturnRead =
         writeReturnRead ? PyObject_IsTrue(writeReturnRead) : 1;
@@ -103,6 +103,8 @@ typedef struct {
     ZSTD_CCtx *cctx;
     /* Compression parameters in use. */
     ZSTD_CCtx_params *params;
+    /* Whether compress() is using cctx. Only accessed with the GIL held. */
+    int cctxInUse;
 } ZstdCompressor;
 
 extern PyTypeObject ZstdCompressorType;
@@ -129,6 +131,10 @@ typedef struct {
     int closed;
     int writeReturnRead;
     int closefd;
+    /* Pledged size of the current frame, if still applicable. */
+    unsigned long long sourceSize;
+    /* Frame was ended by write() and not yet acknowledged by a flush. */
+    int frameEnded;
     unsigned long long bytesCompressed;
 } ZstdCompressionWriter;
 
@@ -27,6 +27,10 @@ pub struct ZstdCompressionWriter {
     entered: bool,
     closing: bool,
     closed: bool,
+    /// Pledged size of the current frame, if still applicable.
+    source_size: u64,
+    /// Frame was ended by write() and not yet acknowledged by a flush.
+    frame_ended: bool,
     bytes_compressed: usize,
     dest_buffer: Vec<u8>,
 }
@@ -52,6 +56,8 @@ impl ZstdCompressionWriter {
             entered: false,
             closing: false,
             closed: false,
+            source_size,
+            frame_ended: false,
             bytes_compressed: 0,
             dest_buffer: Vec::with_capacity(write_size),
         })
@@ -213,22 +219,56 @@ impl ZstdCompressionWriter {
         }
 
         let mut total_write = 0;
+        let source_len = buffer.len_bytes();
 
-        let mut in_buffer = zstd_sys::ZSTD_inBuffer {
-            src: buffer.buf_ptr(),
-            size: buffer.len_bytes(),
-            pos: 0,
+        // Nothing to feed the compressor.
+        if source_len == 0 {
+            return Ok(0);
+        }
+
+        if self.frame_ended {
+            return Err(ZstdError::new_err(
+                "zstd compress error: Src size is incorrect",
+            ));
+        }
+
+        // If a single write provides all of the pledged input, end the frame
+        // now. This allows zstd to compress directly from the source buffer
+        // instead of staging input in its internal buffer first.
+        let end_frame = self.source_size == source_len as u64;
+
+        self.source_size = zstd_sys::ZSTD_CONTENTSIZE_UNKNOWN as _;
+
+        let end_mode = if end_frame {
+            zstd_sys::ZSTD_EndDirective::ZSTD_e_end
+        } else {
+            zstd_sys::ZSTD_EndDirective::ZSTD_e_continue
         };
 
-        while in_buffer.pos < in_buffer.size {
-            self.cctx
-                .compress_into_vec(
-                    &mut self.dest_buffer,
-                    &mut in_buffer,
-                    zstd_sys::ZSTD_EndDirective::ZSTD_e_continue,
-                )
+        let mut source =
+            unsafe { std::slice::from_raw_parts::<u8>(buffer.buf_ptr() as *const _, source_len) };
+        let mut total_read = 0;
+
+        while !source.is_empty() || (end_frame && !self.frame_ended) {
+            let cctx = &self.cctx;
+            let dest_buffer = &mut self.dest_buffer;
+
+            let (zresult, consumed) = py
+                .allow_threads(|| {
+                    let mut in_buffer = zstd_sys::ZSTD_inBuffer {
+                        src: source.as_ptr() as *const _,
+                        size: source.len(),
+                        pos: 0,
+                    };
+
+                    cctx.compress_into_vec(dest_buffer, &mut in_buffer, end_mode)
+                        .map(|zresult| (zresult, in_buffer.pos))
+                })
                 .map_err(|msg| ZstdError::new_err(format!("zstd compress error: {}", msg)))?;
 
+            source = &source[consumed..];
+            total_read += consumed;
+
             if !self.dest_buffer.is_empty() {
                 // TODO avoid buffer copy.
                 let chunk = PyBytes::new(py, &self.dest_buffer);
@@ -238,10 +278,14 @@ impl ZstdCompressionWriter {
                 self.bytes_compressed += self.dest_buffer.len();
                 self.dest_buffer.clear();
             }
+
+            if end_frame && zresult == 0 {
+                self.frame_ended = true;
+            }
         }
 
         if self.write_return_read {
-            Ok(in_buffer.pos)
+            Ok(total_read)
         } else {
             Ok(total_write)
         }
@@ -264,16 +308,21 @@ impl ZstdCompressionWriter {
 
         let mut total_write = 0;
 
-        let mut in_buffer = zstd_sys::ZSTD_inBuffer {
-            src: std::ptr::null_mut(),
-            size: 0,
-            pos: 0,
-        };
-
-        loop {
-            let zresult = self
-                .cctx
-                .compress_into_vec(&mut self.dest_buffer, &mut in_buffer, flush)
+        // If write() already ended the frame, there is nothing to flush.
+        while !self.frame_ended {
+            let cctx = &self.cctx;
+            let dest_buffer = &mut self.dest_buffer;
+
+            let zresult = py
+                .allow_threads(|| {
+                    let mut in_buffer = zstd_sys::ZSTD_inBuffer {
+                        src: std::ptr::null_mut(),
+                        size: 0,
+                        pos: 0,
+                    };
+
+                    cctx.compress_into_vec(dest_buffer, &mut in_buffer, flush)
+                })
                 .map_err(|msg| ZstdError::new_err(format!("zstd compress error: {}", msg)))?;
 
             if !self.dest_buffer.is_empty() {
@@ -291,6 +340,12 @@ impl ZstdCompressionWriter {
             }
         }
 
+        // The pledged size only applies to the first frame.
+        if flush_mode == FLUSH_FRAME {
+            self.frame_ended = false;
+            self.source_size = zstd_sys::ZSTD_CONTENTSIZE_UNKNOWN as _;
+        }
+
         if let Ok(flush) = self.writer.getattr(py, "flush") {
             if !self.closing {
                 flush.call0(py)?;
@@ -19,7 +19,10 @@ use {
         ZstdError,
     },
     pyo3::{buffer::PyBuffer, exceptions::PyValueError, prelude::*, types::PyBytes},
-    std::sync::Arc,
+    std::sync::{
+        atomic::{AtomicBool, Ordering},
+        Arc,
+    },
 };
 
 #[pyclass(module = "zstandard.backend_rust")]
@@ -28,6 +31,8 @@ struct ZstdCompressor {
     dict: Option<Py<ZstdCompressionDict>>,
     params: CCtxParams<'static>,
     cctx: Arc<CCtx<'static>>,
+    /// Whether `compress()` is currently using `cctx`.
+    cctx_in_use: AtomicBool,
 }
 
 impl ZstdCompressor {
@@ -139,6 +144,7 @@ impl ZstdCompressor {
             dict: dict_data,
             params,
             cctx,
+            cctx_in_use: AtomicBool::new(false),
         };
 
         compressor.setup_cctx(py)?;
@@ -164,12 +170,32 @@ impl ZstdCompressor {
         let source: &[u8] =
             unsafe { std::slice::from_raw_parts(buffer.buf_ptr() as *const _, buffer.len_bytes()) };
 
-        let cctx = &self.cctx;
+        // If another thread is compressing with this instance, use a temporary
+        // context with identical settings instead of sharing ours.
+        let data = if self
+            .cctx_in_use
+            .compare_exchange(false, true, Ordering::Acquire, Ordering::Relaxed)
+            .is_ok()
+        {
+            let cctx = &self.cctx;
+
+            // TODO implement 0 copy via Py_SIZE().
+            let res = py.allow_threads(|| cctx.compress(source));
+            self.cctx_in_use.store(false, Ordering::Release);
+
+            res
+        } else {
+            let dict = self.dict.as_ref().map(|dict| dict.borrow(py));
+            let cctx = CCtx::new().or_else(|msg| Err(PyErr::new::<ZstdError, _>(msg)))?;
+            cctx.set_parameters(&self.params)
+                .or_else(|msg| Err(ZstdError::new_err(msg)))?;
+            if let Some(dict) = &dict {
+                dict.load_into_cctx(&cctx)?;
+            }
 
-        // TODO implement 0 copy via Py_SIZE().
-        let data = py
-            .allow_threads(|| cctx.compress(source))
-            .or_else(|msg| Err(ZstdError::new_err(format!("cannot compress: {}", msg))))?;
+            py.allow_threads(|| cctx.compress(source))
+        }
+        .or_else(|msg| Err(ZstdError::new_err(format!("cannot compress: {}", msg))))?;
 
         Ok(PyBytes::new(py, &data))
     }
@@ -402,7 +428,15 @@ impl ZstdCompressor {
         self.cctx.reset();
 
         let size = size.unwrap_or(zstd_sys::ZSTD_CONTENTSIZE_UNKNOWN as _);
-        let write_size = write_size.unwrap_or_else(|| unsafe { zstd_sys::ZSTD_CStreamOutSize() });
+        let mut write_size =
+            write_size.unwrap_or_else(|| unsafe { zstd_sys::ZSTD_CStreamOutSize() });
+
+        // The output can never exceed the compression bound of the input.
+        if size != zstd_sys::ZSTD_CONTENTSIZE_UNKNOWN as u64 && size < write_size as u64 {
+            write_size = std::cmp::min(write_size, unsafe {
+                zstd_sys::ZSTD_compressBound(size as usize)
+            });
+        }
 
         ZstdCompressionWriter::new(
             py,
@@ -1,10 +1,14 @@
 import io
 import os
+import random
 
 from typing import List
 
+import zstandard as zstd
+
 try:
     import hypothesis  # type: ignore
+    import hypothesis.strategies  # type: ignore
 except ImportError:
     hypothesis = None  # type: ignore
 
@@ -31,6 +35,12 @@ class NonClosingBytesIO(io.BytesIO):
 
 
 class CustomBytesIO(io.BytesIO):
+    """BytesIO that counts and can inject errors into I/O calls.
+
+    I/O methods call the ``io.BytesIO`` implementation directly rather than
+    going through ``super()``, as they are invoked for every chunk.
+    """
+
     def __init__(self, *args, **kwargs):
         self._flush_count = 0
         self._read_count = 0
@@ -46,7 +56,7 @@ class CustomBytesIO(io.BytesIO):
         if self.flush_exception:
             raise self.flush_exception
 
-        return super(CustomBytesIO, self).flush()
+        return io.BytesIO.flush(self)
 
     def read(self, *args):
         self._read_count += 1
@@ -54,7 +64,7 @@ class CustomBytesIO(io.BytesIO):
         if self.read_exception:
             raise self.read_exception
 
-        return super(CustomBytesIO, self).read(*args)
+        return io.BytesIO.read(self, *args)
 
     def write(self, data):
         self._write_count += 1
@@ -62,11 +72,13 @@ class CustomBytesIO(io.BytesIO):
         if self.write_exception:
             raise self.write_exception
 
-        return super(CustomBytesIO, self).write(data)
+        return io.BytesIO.write(self, data)
 
 
 _source_files = []  # type: List[bytes]
 
+_RANDOM_SEED = int(os.environ.get("ZSTD_TEST_RANDOM_SEED", "0"))
+
 
 def random_input_data():
     """Obtain the raw content of source files.
@@ -90,16 +102,90 @@ def random_input_data():
             except OSError:
                 pass
 
-    # Also add some actual random data.
-    _source_files.append(os.urandom(100))
-    _source_files.append(os.urandom(1000))
-    _source_files.append(os.urandom(10000))
-    _source_files.append(os.urandom(100000))
-    _source_files.append(os.urandom(1000000))
+    # Also add some actual random data. A fixed seed is used so every process
+    # (e.g. pytest-xdist workers) sees identical inputs and Hypothesis examples
+    # can be replayed.
+    rng = random.Random(_RANDOM_SEED)
+    for size in (100, 1000, 10000, 100000, 1000000):
+        _source_files.append(rng.getrandbits(size * 8).to_bytes(size, "little"))
 
     return _source_files
 
 
+def random_input_strategy():
+    """Hypothesis strategy producing input data for fuzzing.
+
+    Inputs are either an item from ``random_input_data()`` or arbitrary
+    bytes generated by Hypothesis. For the former, an index into the data is
+    drawn rather than the data itself so Hypothesis only needs to track and
+    shrink a small integer. The latter can be shrunk natively by Hypothesis.
+    """
+    data = random_input_data()
+    return hypothesis.strategies.one_of(
+        hypothesis.strategies.integers(0, len(data) - 1).map(data.__getitem__),
+        hypothesis.strategies.binary(min_size=1, max_size=65536),
+    )
+
+
+def assert_chunks_equal(case, chunks, expected):
+    """Assert that the concatenation of ``chunks`` equals ``expected``.
+
+    Each chunk is compared against a view of ``expected`` as it is consumed,
+    so the joined output is never materialized.
+    """
+    view = memoryview(expected)
+    pos = 0
+
+    for chunk in chunks:
+        case.assertEqual(view[pos : pos + len(chunk)], chunk)
+        pos += len(chunk)
+
+    case.assertEqual(pos, len(expected))
+
+
+def assert_frame_parameters(
+    case,
+    data,
+    content_size=zstd.CONTENTSIZE_UNKNOWN,
+    window_size=None,
+    dict_id=0,
+    has_checksum=False,
+):
+    """Assert the frame header in ``data`` has the given parameters.
+
+    ``window_size`` is only checked if specified. All parameters are compared
+    at once, keyed by name, so a failure shows every mismatch.
+    """
+    params = zstd.get_frame_parameters(data)
+
+    actual = {
+        "content_size": params.content_size,
+        "dict_id": params.dict_id,
+        "has_checksum": params.has_checksum,
+    }
+    expected = {
+        "content_size": content_size,
+        "dict_id": dict_id,
+        "has_checksum": has_checksum,
+    }
+
+    if window_size is not None:
+        actual["window_size"] = params.window_size
+        expected["window_size"] = window_size
+
+    case.assertEqual(actual, expected)
+
+
+def scaled_max_examples(factor):
+    """Scale ``max_examples`` of the active Hypothesis profile.
+
+    Used by fuzz tests whose examples are expensive (e.g. because they perform
+    an operation per small chunk of a potentially large input) so they run
+    fewer examples than cheaper tests under every profile.
+    """
+    return max(1, int(hypothesis.settings.default.max_examples * factor))
+
+
 def get_optimal_dict_size_heuristically(src):
     return sum(len(ch) for ch in src) // 100
 
@@ -1,4 +1,5 @@
 import struct
+import threading
 import unittest
 
 import zstandard as zstd
@@ -46,9 +47,7 @@ class TestCompressor_compress(unittest.TestCase):
             self.assertEqual(cctx.compress(source), expected)
 
     def test_compress_large(self):
-        chunks = []
-        for i in range(255):
-            chunks.append(struct.Struct(">B").pack(i) * 16384)
+        chunks = [bytes([i]) * 16384 for i in range(255)]
 
         cctx = zstd.ZstdCompressor(level=3, write_content_size=False)
         result = cctx.compress(b"".join(chunks))
@@ -213,3 +212,29 @@ class TestCompressor_compress(unittest.TestCase):
         self.assertEqual(
             result, b"\x28\xb5\x2f\xfd\x20\x03\x19\x00\x00\x66\x6f\x6f"
         )
+
+    def test_shared_compressor(self):
+        cctx = zstd.ZstdCompressor(level=9, write_checksum=True)
+        dctx = zstd.ZstdDecompressor()
+
+        sources = [
+            b"".join(struct.pack(">I", i * j) for j in range(65536))
+            for i in range(8)
+        ]
+        results = [None] * len(sources)
+
+        def compress(i):
+            results[i] = cctx.compress(sources[i])
+
+        threads = [
+            threading.Thread(target=compress, args=(i,))
+            for i in range(len(sources))
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        for source, result in zip(sources, results):
+            self.assertIsNotNone(result)
+            self.assertEqual(dctx.decompress(result), source)
@@ -1,5 +1,4 @@
 import io
-import struct
 import unittest
 
 import zstandard as zstd
@@ -31,9 +30,7 @@ class TestCompressor_compressobj(unittest.TestCase):
             self.assertEqual(cobj.flush(), expected)
 
     def test_compressobj_large(self):
-        chunks = []
-        for i in range(255):
-            chunks.append(struct.Struct(">B").pack(i) * 16384)
+        chunks = [bytes([i]) * 16384 for i in range(255)]
 
         cctx = zstd.ZstdCompressor(level=3)
         cobj = cctx.compressobj()
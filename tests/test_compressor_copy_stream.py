@@ -1,5 +1,4 @@
 import io
-import struct
 import unittest
 
 import zstandard as zstd
@@ -40,10 +39,7 @@ class TestCompressor_copy_stream(unittest.TestCase):
         )
 
     def test_large_data(self):
-        source = io.BytesIO()
-        for i in range(255):
-            source.write(struct.Struct(">B").pack(i) * 16384)
-        source.seek(0)
+        source = io.BytesIO(b"".join(bytes([i]) * 16384 for i in range(255)))
 
         dest = io.BytesIO()
         cctx = zstd.ZstdCompressor()
@@ -9,6 +9,12 @@ import zstandard as zstd
     "multi_compress_to_buffer feature not available",
 )
 class TestCompressor_multi_compress_to_buffer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # multi_compress_to_buffer() resets the context for every input, so a
+        # single instance can be shared by all tests.
+        cls.cctx = zstd.ZstdCompressor(write_checksum=True)
+
     def test_invalid_inputs(self):
         cctx = zstd.ZstdCompressor()
 
@@ -33,7 +39,7 @@ class TestCompressor_multi_compress_to_buffer(unittest.TestCase):
             cctx.multi_compress_to_buffer([b"", b"", b""])
 
     def test_list_input(self):
-        cctx = zstd.ZstdCompressor(write_checksum=True)
+        cctx = self.cctx
 
         original = [b"foo" * 12, b"bar" * 6]
         frames = [cctx.compress(c) for c in original]
@@ -48,7 +54,7 @@ class TestCompressor_multi_compress_to_buffer(unittest.TestCase):
         self.assertEqual(b[1].tobytes(), frames[1])
 
     def test_buffer_with_segments_input(self):
-        cctx = zstd.ZstdCompressor(write_checksum=True)
+        cctx = self.cctx
 
         original = [b"foo" * 4, b"bar" * 6]
         frames = [cctx.compress(c) for c in original]
@@ -67,7 +73,7 @@ class TestCompressor_multi_compress_to_buffer(unittest.TestCase):
         self.assertEqual(result[1].tobytes(), frames[1])
 
     def test_buffer_with_segments_collection_input(self):
-        cctx = zstd.ZstdCompressor(write_checksum=True)
+        cctx = self.cctx
 
         original = [
             b"foo1",
@@ -77,7 +83,10 @@ class TestCompressor_multi_compress_to_buffer(unittest.TestCase):
             b"foo5" * 5,
         ]
 
-        frames = [cctx.compress(c) for c in original]
+        # test_list_input verifies list input against compress(), so a single
+        # batched call is a valid reference here.
+        reference = cctx.multi_compress_to_buffer(original, threads=0)
+        frames = [reference[i].tobytes() for i in range(len(original))]
 
         b = b"".join([original[0], original[1]])
         b1 = zstd.BufferWithSegments(
@@ -112,10 +121,8 @@ class TestCompressor_multi_compress_to_buffer(unittest.TestCase):
     def test_multiple_threads(self):
         # threads argument will cause multi-threaded ZSTD APIs to be used, which will
         # make output different.
-        refcctx = zstd.ZstdCompressor(write_checksum=True)
-        reference = [refcctx.compress(b"x" * 64), refcctx.compress(b"y" * 64)]
-
-        cctx = zstd.ZstdCompressor(write_checksum=True)
+        cctx = self.cctx
+        reference = [cctx.compress(b"x" * 64), cctx.compress(b"y" * 64)]
 
         frames = []
         frames.extend(b"x" * 64 for i in range(256))
@@ -46,14 +46,12 @@ class TestCompressor_read_to_iter(unittest.TestCase):
     def test_read_large(self):
         cctx = zstd.ZstdCompressor(level=1, write_content_size=False)
 
-        source = io.BytesIO()
-        source.write(b"f" * zstd.COMPRESSION_RECOMMENDED_INPUT_SIZE)
-        source.write(b"o")
-        source.seek(0)
+        data = b"f" * zstd.COMPRESSION_RECOMMENDED_INPUT_SIZE + b"o"
+        source = io.BytesIO(data)
 
         # Creating an iterator should not perform any compression until
         # first read.
-        it = cctx.read_to_iter(source, size=len(source.getvalue()))
+        it = cctx.read_to_iter(source, size=len(data))
         self.assertEqual(source.tell(), 0)
 
         # We should have exactly 2 output chunks.
@@ -66,7 +64,7 @@ class TestCompressor_read_to_iter(unittest.TestCase):
         self.assertIsNotNone(chunk)
         chunks.append(chunk)
 
-        self.assertEqual(source.tell(), len(source.getvalue()))
+        self.assertEqual(source.tell(), len(data))
 
         with self.assertRaises(StopIteration):
             next(it)
@@ -76,7 +74,7 @@ class TestCompressor_read_to_iter(unittest.TestCase):
             next(it)
 
         # We should get the same output as the one-shot compression mechanism.
-        self.assertEqual(b"".join(chunks), cctx.compress(source.getvalue()))
+        self.assertEqual(b"".join(chunks), cctx.compress(data))
 
         params = zstd.get_frame_parameters(b"".join(chunks))
         self.assertEqual(params.content_size, zstd.CONTENTSIZE_UNKNOWN)
@@ -85,7 +83,7 @@ class TestCompressor_read_to_iter(unittest.TestCase):
         self.assertFalse(params.has_checksum)
 
         # Now check the buffer protocol.
-        it = cctx.read_to_iter(source.getvalue())
+        it = cctx.read_to_iter(data)
         chunks = list(it)
         self.assertEqual(len(chunks), 2)
 
@@ -95,7 +93,7 @@ class TestCompressor_read_to_iter(unittest.TestCase):
         self.assertEqual(params.dict_id, 0)
         self.assertFalse(params.has_checksum)
 
-        self.assertEqual(b"".join(chunks), cctx.compress(source.getvalue()))
+        self.assertEqual(b"".join(chunks), cctx.compress(data))
 
     def test_read_write_size(self):
         source = CustomBytesIO(b"foobarfoobar")
@@ -105,6 +103,18 @@ class TestCompressor_read_to_iter(unittest.TestCase):
 
         self.assertEqual(source._read_count, len(source.getvalue()) + 1)
 
+    def test_read_write_size_buffer(self):
+        source = b"".join(b"line %d\n" % i for i in range(32768))
+        cctx = zstd.ZstdCompressor(level=1)
+
+        # A small write_size leaves input from a buffer source pending across
+        # iterations.
+        chunks = list(
+            cctx.read_to_iter(source, read_size=len(source), write_size=16)
+        )
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(b"".join(chunks), cctx.compress(source))
+
     def test_multithreaded(self):
         source = io.BytesIO()
         source.write(b"a" * 1048576)
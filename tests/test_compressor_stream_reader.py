@@ -10,6 +10,19 @@ from .common import (
 
 
 class TestCompressor_stream_reader(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cctx = zstd.ZstdCompressor()
+
+        cls.mixed_source = b"".join([b"foo" * 60, b"bar" * 60, b"baz" * 60])
+
+        cls.foo_frame = cctx.compress(b"foo")
+        cls.foo60_frame = cctx.compress(b"foo" * 60)
+        cls.foo1024_frame = cctx.compress(b"foo" * 1024)
+        cls.mixed_frame = cctx.compress(cls.mixed_source)
+        # Streaming without a size does not write the content size.
+        cls.foo_unsized_frame = b"".join(cctx.read_to_iter(io.BytesIO(b"foo")))
+
     def test_context_manager(self):
         cctx = zstd.ZstdCompressor()
 
@@ -79,7 +92,7 @@ class TestCompressor_stream_reader(unittest.TestCase):
 
     def test_read_sizes(self):
         cctx = zstd.ZstdCompressor()
-        foo = cctx.compress(b"foo")
+        foo = self.foo_frame
 
         with cctx.stream_reader(b"foo") as reader:
             with self.assertRaisesRegex(
@@ -93,8 +106,8 @@ class TestCompressor_stream_reader(unittest.TestCase):
     def test_read_buffer(self):
         cctx = zstd.ZstdCompressor()
 
-        source = b"".join([b"foo" * 60, b"bar" * 60, b"baz" * 60])
-        frame = cctx.compress(source)
+        source = self.mixed_source
+        frame = self.mixed_frame
 
         with cctx.stream_reader(source) as reader:
             self.assertEqual(reader.tell(), 0)
@@ -110,26 +123,30 @@ class TestCompressor_stream_reader(unittest.TestCase):
         cctx = zstd.ZstdCompressor()
 
         source = b"foo" * 60
-        chunks = []
+        frame = self.foo60_frame
+
+        buf = bytearray(len(frame) + 16)
+        mv = memoryview(buf)
+        pos = 0
 
         with cctx.stream_reader(source) as reader:
             self.assertEqual(reader.tell(), 0)
 
             while True:
-                chunk = reader.read(1)
-                if not chunk:
+                count = reader.readinto(mv[pos : pos + 1])
+                if not count:
                     break
 
-                chunks.append(chunk)
-                self.assertEqual(reader.tell(), sum(map(len, chunks)))
+                pos += count
+                self.assertEqual(reader.tell(), pos)
 
-        self.assertEqual(b"".join(chunks), cctx.compress(source))
+        self.assertEqual(bytes(buf[:pos]), frame)
 
     def test_read_stream(self):
         cctx = zstd.ZstdCompressor()
 
-        source = b"".join([b"foo" * 60, b"bar" * 60, b"baz" * 60])
-        frame = cctx.compress(source)
+        source = self.mixed_source
+        frame = self.mixed_frame
 
         with cctx.stream_reader(io.BytesIO(source), size=len(source)) as reader:
             self.assertEqual(reader.tell(), 0)
@@ -144,20 +161,24 @@ class TestCompressor_stream_reader(unittest.TestCase):
         cctx = zstd.ZstdCompressor()
 
         source = b"foo" * 60
-        chunks = []
+        frame = self.foo60_frame
+
+        buf = bytearray(len(frame) + 16)
+        mv = memoryview(buf)
+        pos = 0
 
         with cctx.stream_reader(io.BytesIO(source), size=len(source)) as reader:
             self.assertEqual(reader.tell(), 0)
 
             while True:
-                chunk = reader.read(1)
-                if not chunk:
+                count = reader.readinto(mv[pos : pos + 1])
+                if not count:
                     break
 
-                chunks.append(chunk)
-                self.assertEqual(reader.tell(), sum(map(len, chunks)))
+                pos += count
+                self.assertEqual(reader.tell(), pos)
 
-        self.assertEqual(b"".join(chunks), cctx.compress(source))
+        self.assertEqual(bytes(buf[:pos]), frame)
 
     def test_read_after_exit(self):
         cctx = zstd.ZstdCompressor()
@@ -186,14 +207,14 @@ class TestCompressor_stream_reader(unittest.TestCase):
 
     def test_readall(self):
         cctx = zstd.ZstdCompressor()
-        frame = cctx.compress(b"foo" * 1024)
+        frame = self.foo1024_frame
 
         reader = cctx.stream_reader(b"foo" * 1024)
         self.assertEqual(reader.readall(), frame)
 
     def test_readinto(self):
         cctx = zstd.ZstdCompressor()
-        foo = cctx.compress(b"foo")
+        foo = self.foo_frame
 
         reader = cctx.stream_reader(b"foo")
         with self.assertRaises(Exception):
@@ -225,7 +246,7 @@ class TestCompressor_stream_reader(unittest.TestCase):
 
     def test_readinto1(self):
         cctx = zstd.ZstdCompressor()
-        foo = b"".join(cctx.read_to_iter(io.BytesIO(b"foo")))
+        foo = self.foo_unsized_frame
 
         reader = cctx.stream_reader(b"foo")
         with self.assertRaises(Exception):
@@ -248,7 +269,7 @@ class TestCompressor_stream_reader(unittest.TestCase):
 
     def test_read1(self):
         cctx = zstd.ZstdCompressor()
-        foo = b"".join(cctx.read_to_iter(io.BytesIO(b"foo")))
+        foo = self.foo_unsized_frame
 
         b = CustomBytesIO(b"foo")
         reader = cctx.stream_reader(b)
@@ -10,13 +10,53 @@ import zstandard as zstd
 from .common import (
     NonClosingBytesIO,
     CustomBytesIO,
+    assert_frame_parameters,
+)
+
+# Inputs shared by multiple tests. Defined once so each test doesn't have to
+# materialize its own copy.
+X_8K = b"x" * 8192
+FOO_48K = b"foo" * 16384
+BIZ_48K = b"biz" * 16384
+FOOBAR_48K = b"foobar" * 8192
+FOOBAR_96K = b"foobar" * 16384
+A_1M = b"a" * 1048576
+B_1M = b"b" * 1048576
+C_1M = b"c" * 1048576
+
+# Expected output of various compression operations below.
+EMPTY_FRAME = b"\x28\xb5\x2f\xfd\x00\x00\x01\x00\x00"
+FOO_FRAME = b"\x28\xb5\x2f\xfd\x00\x48\x19\x00\x00\x66\x6f\x6f"
+FOO_1024_FRAME = (
+    b"\x28\xb5\x2f\xfd\x00\x48\x55\x00\x00\x18\x66\x6f"
+    b"\x6f\x01\x00\xfa\xd3\x77\x43"
+)
+FOO_BAR_X_FRAME = (
+    b"\x28\xb5\x2f\xfd\x00\x58\x75\x00\x00\x38\x66\x6f"
+    b"\x6f\x62\x61\x72\x78\x01\x00\xfc\xdf\x03\x23"
 )
 
 
 class TestCompressor_stream_writer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        samples = [b"foo" * 64, b"bar" * 64, b"foobar" * 64] * 128
+
+        # Dictionary training dwarfs the cost of the compression being tested.
+        cls.dict_8k = zstd.train_dictionary(8192, samples)
+        cls.dict_1k = zstd.train_dictionary(1024, samples)
+
+        # Compressors for tests that don't need special settings. Every
+        # stream_writer() call resets the session, so these can be shared.
+        cls.cctx = zstd.ZstdCompressor()
+        cls.cctx_level1 = zstd.ZstdCompressor(level=1)
+
+        with open(__file__, "rb") as fh:
+            cls.source_file = fh.read()
+
     def test_io_api(self):
         buffer = io.BytesIO()
-        cctx = zstd.ZstdCompressor()
+        cctx = self.cctx
         writer = cctx.stream_writer(buffer)
 
         self.assertFalse(writer.isatty())
@@ -84,14 +124,14 @@ class TestCompressor_stream_writer(unittest.TestCase):
 
     def test_fileno_file(self):
         with tempfile.TemporaryFile("wb") as tf:
-            cctx = zstd.ZstdCompressor()
+            cctx = self.cctx
             writer = cctx.stream_writer(tf)
 
             self.assertEqual(writer.fileno(), tf.fileno())
 
     def test_close(self):
         buffer = NonClosingBytesIO()
-        cctx = zstd.ZstdCompressor(level=1)
+        cctx = self.cctx_level1
         writer = cctx.stream_writer(buffer)
 
         writer.write(b"foo" * 1024)
@@ -111,11 +151,7 @@ class TestCompressor_stream_writer(unittest.TestCase):
             with writer:
                 pass
 
-        self.assertEqual(
-            buffer.getvalue(),
-            b"\x28\xb5\x2f\xfd\x00\x48\x55\x00\x00\x18\x66\x6f"
-            b"\x6f\x01\x00\xfa\xd3\x77\x43",
-        )
+        self.assertEqual(buffer.getvalue(), FOO_1024_FRAME)
 
         # Context manager exit should close stream.
         buffer = CustomBytesIO()
@@ -143,7 +179,7 @@ class TestCompressor_stream_writer(unittest.TestCase):
 
     def test_close_closefd_false(self):
         buffer = io.BytesIO()
-        cctx = zstd.ZstdCompressor(level=1)
+        cctx = self.cctx_level1
         writer = cctx.stream_writer(buffer, closefd=False)
 
         writer.write(b"foo" * 1024)
@@ -163,11 +199,7 @@ class TestCompressor_stream_writer(unittest.TestCase):
             with writer:
                 pass
 
-        self.assertEqual(
-            buffer.getvalue(),
-            b"\x28\xb5\x2f\xfd\x00\x48\x55\x00\x00\x18\x66\x6f"
-            b"\x6f\x01\x00\xfa\xd3\x77\x43",
-        )
+        self.assertEqual(buffer.getbuffer(), FOO_1024_FRAME)
 
         # Context manager exit should not close stream.
         buffer = CustomBytesIO()
@@ -200,13 +232,9 @@ class TestCompressor_stream_writer(unittest.TestCase):
             compressor.write(b"")
 
         result = buffer.getvalue()
-        self.assertEqual(result, b"\x28\xb5\x2f\xfd\x00\x00\x01\x00\x00")
+        self.assertEqual(result, EMPTY_FRAME)
 
-        params = zstd.get_frame_parameters(result)
-        self.assertEqual(params.content_size, zstd.CONTENTSIZE_UNKNOWN)
-        self.assertEqual(params.window_size, 1024)
-        self.assertEqual(params.dict_id, 0)
-        self.assertFalse(params.has_checksum)
+        assert_frame_parameters(self, result, window_size=1024)
 
         # Test without context manager.
         buffer = io.BytesIO()
@@ -215,21 +243,16 @@ class TestCompressor_stream_writer(unittest.TestCase):
         self.assertEqual(buffer.getvalue(), b"")
         self.assertEqual(compressor.flush(zstd.FLUSH_FRAME), 9)
         result = buffer.getvalue()
-        self.assertEqual(result, b"\x28\xb5\x2f\xfd\x00\x00\x01\x00\x00")
+        self.assertEqual(result, EMPTY_FRAME)
 
-        params = zstd.get_frame_parameters(result)
-        self.assertEqual(params.content_size, zstd.CONTENTSIZE_UNKNOWN)
-        self.assertEqual(params.window_size, 1024)
-        self.assertEqual(params.dict_id, 0)
-        self.assertFalse(params.has_checksum)
+        assert_frame_parameters(self, result, window_size=1024)
 
         # Test write_return_read=False
         compressor = cctx.stream_writer(buffer, write_return_read=False)
         self.assertEqual(compressor.write(b""), 0)
 
     def test_input_types(self):
-        expected = b"\x28\xb5\x2f\xfd\x00\x48\x19\x00\x00\x66\x6f\x6f"
-        cctx = zstd.ZstdCompressor(level=1)
+        cctx = self.cctx_level1
 
         mutable_array = bytearray(3)
         mutable_array[:] = b"foo"
@@ -245,7 +268,7 @@ class TestCompressor_stream_writer(unittest.TestCase):
             with cctx.stream_writer(buffer, closefd=False) as compressor:
                 compressor.write(source)
 
-            self.assertEqual(buffer.getvalue(), expected)
+            self.assertEqual(buffer.getbuffer(), FOO_FRAME)
 
             compressor = cctx.stream_writer(buffer, write_return_read=False)
             self.assertEqual(compressor.write(source), 0)
@@ -256,43 +279,27 @@ class TestCompressor_stream_writer(unittest.TestCase):
         with cctx.stream_writer(buffer, closefd=False) as compressor:
             self.assertEqual(compressor.write(b"foo"), 3)
             self.assertEqual(compressor.write(b"bar"), 3)
-            self.assertEqual(compressor.write(b"x" * 8192), 8192)
+            self.assertEqual(compressor.write(X_8K), 8192)
 
-        result = buffer.getvalue()
-        self.assertEqual(
-            result,
-            b"\x28\xb5\x2f\xfd\x00\x58\x75\x00\x00\x38\x66\x6f"
-            b"\x6f\x62\x61\x72\x78\x01\x00\xfc\xdf\x03\x23",
-        )
+        self.assertEqual(buffer.getbuffer(), FOO_BAR_X_FRAME)
 
         # Test without context manager.
         buffer = io.BytesIO()
         compressor = cctx.stream_writer(buffer)
         self.assertEqual(compressor.write(b"foo"), 3)
         self.assertEqual(compressor.write(b"bar"), 3)
-        self.assertEqual(compressor.write(b"x" * 8192), 8192)
+        self.assertEqual(compressor.write(X_8K), 8192)
         self.assertEqual(compressor.flush(zstd.FLUSH_FRAME), 23)
-        result = buffer.getvalue()
-        self.assertEqual(
-            result,
-            b"\x28\xb5\x2f\xfd\x00\x58\x75\x00\x00\x38\x66\x6f"
-            b"\x6f\x62\x61\x72\x78\x01\x00\xfc\xdf\x03\x23",
-        )
+        self.assertEqual(buffer.getbuffer(), FOO_BAR_X_FRAME)
 
         # Test with write_return_read=False.
         compressor = cctx.stream_writer(buffer, write_return_read=False)
         self.assertEqual(compressor.write(b"foo"), 0)
         self.assertEqual(compressor.write(b"barbiz"), 0)
-        self.assertEqual(compressor.write(b"x" * 8192), 0)
+        self.assertEqual(compressor.write(X_8K), 0)
 
     def test_dictionary(self):
-        samples = []
-        for i in range(128):
-            samples.append(b"foo" * 64)
-            samples.append(b"bar" * 64)
-            samples.append(b"foobar" * 64)
-
-        d = zstd.train_dictionary(8192, samples)
+        d = self.dict_8k
 
         h = hashlib.sha1(d.as_bytes()).hexdigest()
         self.assertEqual(h, "e739fb6cecd613386b8fffc777f756f5e6115e73")
@@ -302,20 +309,18 @@ class TestCompressor_stream_writer(unittest.TestCase):
         with cctx.stream_writer(buffer, closefd=False) as compressor:
             self.assertEqual(compressor.write(b"foo"), 3)
             self.assertEqual(compressor.write(b"bar"), 3)
-            self.assertEqual(compressor.write(b"foo" * 16384), 3 * 16384)
+            self.assertEqual(compressor.write(FOO_48K), 3 * 16384)
 
-        compressed = buffer.getvalue()
+        compressed = buffer.getbuffer()
 
-        params = zstd.get_frame_parameters(compressed)
-        self.assertEqual(params.content_size, zstd.CONTENTSIZE_UNKNOWN)
-        self.assertEqual(params.window_size, 2097152)
-        self.assertEqual(params.dict_id, d.dict_id())
-        self.assertFalse(params.has_checksum)
+        assert_frame_parameters(
+            self, compressed, window_size=2097152, dict_id=d.dict_id()
+        )
 
         h = hashlib.sha1(compressed).hexdigest()
         self.assertEqual(h, "8703b4316f274d26697ea5dd480f29c08e85d940")
 
-        source = b"foo" + b"bar" + (b"foo" * 16384)
+        source = b"foo" + b"bar" + FOO_48K
 
         dctx = zstd.ZstdDecompressor(dict_data=d)
 
@@ -339,22 +344,18 @@ class TestCompressor_stream_writer(unittest.TestCase):
         with cctx.stream_writer(buffer, closefd=False) as compressor:
             self.assertEqual(compressor.write(b"foo"), 3)
             self.assertEqual(compressor.write(b"bar"), 3)
-            self.assertEqual(compressor.write(b"foobar" * 16384), 6 * 16384)
+            self.assertEqual(compressor.write(FOOBAR_96K), 6 * 16384)
 
-        compressed = buffer.getvalue()
+        compressed = buffer.getbuffer()
 
-        params = zstd.get_frame_parameters(compressed)
-        self.assertEqual(params.content_size, zstd.CONTENTSIZE_UNKNOWN)
-        self.assertEqual(params.window_size, 1048576)
-        self.assertEqual(params.dict_id, 0)
-        self.assertFalse(params.has_checksum)
+        assert_frame_parameters(self, compressed, window_size=1048576)
 
         h = hashlib.sha1(compressed).hexdigest()
         self.assertEqual(h, "dd4bb7d37c1a0235b38a2f6b462814376843ef0b")
 
     def test_write_checksum(self):
         no_checksum = io.BytesIO()
-        cctx = zstd.ZstdCompressor(level=1)
+        cctx = self.cctx_level1
         with cctx.stream_writer(no_checksum, closefd=False) as compressor:
             self.assertEqual(compressor.write(b"foobar"), 6)
 
@@ -363,14 +364,10 @@ class TestCompressor_stream_writer(unittest.TestCase):
         with cctx.stream_writer(with_checksum, closefd=False) as compressor:
             self.assertEqual(compressor.write(b"foobar"), 6)
 
-        no_params = zstd.get_frame_parameters(no_checksum.getvalue())
-        with_params = zstd.get_frame_parameters(with_checksum.getvalue())
-        self.assertEqual(no_params.content_size, zstd.CONTENTSIZE_UNKNOWN)
-        self.assertEqual(with_params.content_size, zstd.CONTENTSIZE_UNKNOWN)
-        self.assertEqual(no_params.dict_id, 0)
-        self.assertEqual(with_params.dict_id, 0)
-        self.assertFalse(no_params.has_checksum)
-        self.assertTrue(with_params.has_checksum)
+        assert_frame_parameters(self, no_checksum.getbuffer())
+        assert_frame_parameters(
+            self, with_checksum.getbuffer(), has_checksum=True
+        )
 
         self.assertEqual(
             len(with_checksum.getvalue()), len(no_checksum.getvalue()) + 4
@@ -385,7 +382,7 @@ class TestCompressor_stream_writer(unittest.TestCase):
             )
 
         with_size = io.BytesIO()
-        cctx = zstd.ZstdCompressor(level=1)
+        cctx = self.cctx_level1
         with cctx.stream_writer(with_size, closefd=False) as compressor:
             self.assertEqual(
                 compressor.write(b"foobar" * 256), len(b"foobar" * 256)
@@ -404,25 +401,13 @@ class TestCompressor_stream_writer(unittest.TestCase):
                 compressor.write(b"foobar" * 256), len(b"foobar" * 256)
             )
 
-        no_params = zstd.get_frame_parameters(no_size.getvalue())
-        with_params = zstd.get_frame_parameters(with_size.getvalue())
-        self.assertEqual(no_params.content_size, zstd.CONTENTSIZE_UNKNOWN)
-        self.assertEqual(with_params.content_size, 1536)
-        self.assertEqual(no_params.dict_id, 0)
-        self.assertEqual(with_params.dict_id, 0)
-        self.assertFalse(no_params.has_checksum)
-        self.assertFalse(with_params.has_checksum)
+        assert_frame_parameters(self, no_size.getbuffer())
+        assert_frame_parameters(self, with_size.getbuffer(), content_size=1536)
 
         self.assertEqual(len(with_size.getvalue()), len(no_size.getvalue()) + 1)
 
     def test_no_dict_id(self):
-        samples = []
-        for i in range(128):
-            samples.append(b"foo" * 64)
-            samples.append(b"bar" * 64)
-            samples.append(b"foobar" * 64)
-
-        d = zstd.train_dictionary(1024, samples)
+        d = self.dict_1k
 
         with_dict_id = io.BytesIO()
         cctx = zstd.ZstdCompressor(level=1, dict_data=d)
@@ -438,21 +423,17 @@ class TestCompressor_stream_writer(unittest.TestCase):
 
         self.assertEqual(no_dict_id.getvalue()[4:5], b"\x00")
 
-        no_params = zstd.get_frame_parameters(no_dict_id.getvalue())
-        with_params = zstd.get_frame_parameters(with_dict_id.getvalue())
-        self.assertEqual(no_params.content_size, zstd.CONTENTSIZE_UNKNOWN)
-        self.assertEqual(with_params.content_size, zstd.CONTENTSIZE_UNKNOWN)
-        self.assertEqual(no_params.dict_id, 0)
-        self.assertEqual(with_params.dict_id, d.dict_id())
-        self.assertFalse(no_params.has_checksum)
-        self.assertFalse(with_params.has_checksum)
+        assert_frame_parameters(self, no_dict_id.getbuffer())
+        assert_frame_parameters(
+            self, with_dict_id.getbuffer(), dict_id=d.dict_id()
+        )
 
         self.assertEqual(
             len(with_dict_id.getvalue()), len(no_dict_id.getvalue()) + 4
         )
 
     def test_memory_size(self):
-        cctx = zstd.ZstdCompressor(level=3)
+        cctx = self.cctx
         buffer = io.BytesIO()
         with cctx.stream_writer(buffer) as compressor:
             compressor.write(b"foo")
@@ -461,7 +442,7 @@ class TestCompressor_stream_writer(unittest.TestCase):
         self.assertGreater(size, 100000)
 
     def test_write_size(self):
-        cctx = zstd.ZstdCompressor(level=3)
+        cctx = self.cctx
         dest = CustomBytesIO()
         with cctx.stream_writer(
             dest, write_size=1, closefd=False
@@ -473,7 +454,7 @@ class TestCompressor_stream_writer(unittest.TestCase):
         self.assertEqual(len(dest.getvalue()), dest._write_count)
 
     def test_flush_repeated(self):
-        cctx = zstd.ZstdCompressor(level=3)
+        cctx = self.cctx
         dest = CustomBytesIO()
         with cctx.stream_writer(dest, closefd=False) as compressor:
             self.assertEqual(compressor.write(b"foo"), 3)
@@ -495,7 +476,7 @@ class TestCompressor_stream_writer(unittest.TestCase):
         cctx = zstd.ZstdCompressor(level=3, write_checksum=True)
         dest = CustomBytesIO()
         with cctx.stream_writer(dest, closefd=False) as compressor:
-            self.assertEqual(compressor.write(b"foobar" * 8192), 6 * 8192)
+            self.assertEqual(compressor.write(FOOBAR_48K), 6 * 8192)
             count = dest._write_count
             offset = dest.tell()
             self.assertEqual(compressor.flush(), 23)
@@ -516,19 +497,19 @@ class TestCompressor_stream_writer(unittest.TestCase):
         self.assertEqual(header, b"\x01\x00\x00")
 
     def test_flush_frame(self):
-        cctx = zstd.ZstdCompressor(level=3)
+        cctx = self.cctx
         dest = CustomBytesIO()
 
         with cctx.stream_writer(dest, closefd=False) as compressor:
-            self.assertEqual(compressor.write(b"foobar" * 8192), 6 * 8192)
+            self.assertEqual(compressor.write(FOOBAR_48K), 6 * 8192)
             self.assertEqual(compressor.flush(zstd.FLUSH_FRAME), 23)
             self.assertEqual(dest._flush_count, 1)
-            compressor.write(b"biz" * 16384)
+            compressor.write(BIZ_48K)
 
         self.assertEqual(dest._flush_count, 1)
 
         self.assertEqual(
-            dest.getvalue(),
+            dest.getbuffer(),
             # Frame 1.
             b"\x28\xb5\x2f\xfd\x00\x58\x75\x00\x00\x30\x66\x6f\x6f"
             b"\x62\x61\x72\x01\x00\xf7\xbf\xe8\xa5\x08"
@@ -538,7 +519,7 @@ class TestCompressor_stream_writer(unittest.TestCase):
         )
 
     def test_bad_flush_mode(self):
-        cctx = zstd.ZstdCompressor()
+        cctx = self.cctx
         dest = io.BytesIO()
         with cctx.stream_writer(dest) as compressor:
             with self.assertRaisesRegex(ValueError, "unknown flush_mode: 42"):
@@ -548,24 +529,43 @@ class TestCompressor_stream_writer(unittest.TestCase):
         dest = io.BytesIO()
         cctx = zstd.ZstdCompressor(threads=2)
         with cctx.stream_writer(dest, closefd=False) as compressor:
-            compressor.write(b"a" * 1048576)
-            compressor.write(b"b" * 1048576)
-            compressor.write(b"c" * 1048576)
+            compressor.write(A_1M)
+            compressor.write(B_1M)
+            compressor.write(C_1M)
 
         self.assertEqual(len(dest.getvalue()), 111)
 
+        # Multi-threaded compression with the input size declared up front.
+        dest = io.BytesIO()
+        with cctx.stream_writer(
+            dest, size=3 * 1048576, closefd=False
+        ) as compressor:
+            compressor.write(A_1M)
+            compressor.write(B_1M)
+            compressor.write(C_1M)
+
+        self.assertEqual(len(dest.getvalue()), 115)
+        params = zstd.get_frame_parameters(dest.getvalue())
+        self.assertEqual(params.content_size, 3 * 1048576)
+
     def test_tell(self):
         dest = io.BytesIO()
-        cctx = zstd.ZstdCompressor()
+        cctx = self.cctx
         with cctx.stream_writer(dest) as compressor:
             self.assertEqual(compressor.tell(), 0)
 
+            compressor_tells = []
+            dest_tells = []
+
             for i in range(256):
                 compressor.write(b"foo" * (i + 1))
-                self.assertEqual(compressor.tell(), dest.tell())
+                compressor_tells.append(compressor.tell())
+                dest_tells.append(dest.tell())
+
+            self.assertEqual(compressor_tells, dest_tells)
 
     def test_bad_size(self):
-        cctx = zstd.ZstdCompressor()
+        cctx = self.cctx
 
         dest = io.BytesIO()
 
@@ -577,12 +577,58 @@ class TestCompressor_stream_writer(unittest.TestCase):
         with cctx.stream_writer(dest, size=42):
             pass
 
+    def test_write_full_size(self):
+        source = b"foobar" * 256
+        cctx = self.cctx
+        frame = cctx.compress(source)
+
+        dest = NonClosingBytesIO()
+        compressor = cctx.stream_writer(
+            dest, size=len(source), write_return_read=False
+        )
+
+        # Writing all of the declared input at once emits the entire frame.
+        self.assertEqual(compressor.write(source), len(frame))
+        self.assertEqual(dest.getvalue(), frame)
+        self.assertEqual(compressor.tell(), len(frame))
+
+        # Flushing does not emit anything else.
+        self.assertEqual(compressor.flush(), 0)
+        compressor.close()
+        self.assertEqual(dest.getvalue(), frame)
+
+        # Additional input exceeds the declared size.
+        dest = NonClosingBytesIO()
+        with cctx.stream_writer(dest, size=len(source)) as compressor:
+            compressor.write(source)
+            compressor.write(b"")
+
+            with self.assertRaisesRegex(
+                zstd.ZstdError, "Src size is incorrect"
+            ):
+                compressor.write(b"foo")
+
+        self.assertEqual(dest.getvalue(), frame)
+
+        # A subsequent frame does not have a declared size.
+        dest = NonClosingBytesIO()
+        with cctx.stream_writer(dest, size=len(source)) as compressor:
+            compressor.write(source)
+            compressor.flush(zstd.FLUSH_FRAME)
+            compressor.write(source)
+
+        self.assertTrue(dest.getvalue().startswith(frame))
+        params = zstd.get_frame_parameters(dest.getvalue()[len(frame) :])
+        self.assertEqual(params.content_size, zstd.CONTENTSIZE_UNKNOWN)
+
     def test_tarfile_compat(self):
         dest = io.BytesIO()
-        cctx = zstd.ZstdCompressor()
+        cctx = self.cctx
         with cctx.stream_writer(dest, closefd=False) as compressor:
             with tarfile.open("tf", mode="w|", fileobj=compressor) as tf:
-                tf.add(__file__, "test_compressor.py")
+                info = tarfile.TarInfo("test_compressor.py")
+                info.size = len(self.source_file)
+                tf.addfile(info, io.BytesIO(self.source_file))
 
         dest = io.BytesIO(dest.getvalue())
 
@@ -591,3 +637,6 @@ class TestCompressor_stream_writer(unittest.TestCase):
             with tarfile.open(mode="r|", fileobj=reader) as tf:
                 for member in tf:
                     self.assertEqual(member.name, "test_compressor.py")
+                    self.assertEqual(
+                        tf.extractfile(member).read(), self.source_file
+                    )
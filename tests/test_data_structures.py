@@ -2,6 +2,64 @@ import unittest
 
 import zstandard as zstd
 
+from .common import assert_frame_parameters
+
+# Constructor arguments for ZstdCompressionParameters. Each argument should be
+# reflected by the attribute of the same name.
+MEMBER_CASES = [
+    dict(
+        window_log=10,
+        chain_log=6,
+        hash_log=7,
+        search_log=4,
+        min_match=5,
+        target_length=8,
+        strategy=1,
+    ),
+    dict(compression_level=2),
+    dict(threads=4),
+    dict(threads=2, job_size=1048576, overlap_log=6),
+    dict(compression_level=-1),
+    dict(compression_level=-2),
+    dict(force_max_window=True),
+    dict(enable_ldm=True),
+    dict(ldm_hash_log=7),
+    dict(ldm_min_match=6),
+    dict(ldm_bucket_size_log=7),
+    dict(ldm_hash_rate_log=8),
+]
+
+# Minimal frame headers exercising the frame header descriptor.
+HEADER_EMPTY = zstd.FRAME_HEADER + b"\x00\x00"
+# Lowest 2 bits indicate a dictionary and length. Here, the dict id is 1 byte.
+HEADER_DICT_ID = zstd.FRAME_HEADER + b"\x01\x00\xff"
+# Lowest 3rd bit indicates if checksum is present.
+HEADER_CHECKSUM = zstd.FRAME_HEADER + b"\x04\x00"
+# Upper 2 bits indicate content size.
+HEADER_CONTENT_SIZE = zstd.FRAME_HEADER + b"\x40\x00\xff\x00"
+# Window descriptor is 2nd byte after frame header.
+HEADER_WINDOW = zstd.FRAME_HEADER + b"\x00\x40"
+# Set multiple things.
+HEADER_ALL = zstd.FRAME_HEADER + b"\x45\x40\x0f\x10\x00"
+
+# Frame headers and the parameters get_frame_parameters() should report.
+HEADER_CASES = [
+    (HEADER_EMPTY, dict(window_size=1024)),
+    (HEADER_DICT_ID, dict(window_size=1024, dict_id=255)),
+    (HEADER_CHECKSUM, dict(window_size=1024, has_checksum=True)),
+    (HEADER_CONTENT_SIZE, dict(content_size=511, window_size=1024)),
+    (HEADER_WINDOW, dict(window_size=262144)),
+    (
+        HEADER_ALL,
+        dict(
+            content_size=272,
+            window_size=262144,
+            dict_id=15,
+            has_checksum=True,
+        ),
+    ),
+]
+
 
 class TestCompressionParameters(unittest.TestCase):
     def test_bounds(self):
@@ -35,59 +93,12 @@ class TestCompressionParameters(unittest.TestCase):
         self.assertEqual(p.window_log, 19)
 
     def test_members(self):
-        p = zstd.ZstdCompressionParameters(
-            window_log=10,
-            chain_log=6,
-            hash_log=7,
-            search_log=4,
-            min_match=5,
-            target_length=8,
-            strategy=1,
-        )
-        self.assertEqual(p.window_log, 10)
-        self.assertEqual(p.chain_log, 6)
-        self.assertEqual(p.hash_log, 7)
-        self.assertEqual(p.search_log, 4)
-        self.assertEqual(p.min_match, 5)
-        self.assertEqual(p.target_length, 8)
-        self.assertEqual(p.strategy, 1)
-
-        p = zstd.ZstdCompressionParameters(compression_level=2)
-        self.assertEqual(p.compression_level, 2)
-
-        p = zstd.ZstdCompressionParameters(threads=4)
-        self.assertEqual(p.threads, 4)
-
-        p = zstd.ZstdCompressionParameters(
-            threads=2, job_size=1048576, overlap_log=6
-        )
-        self.assertEqual(p.threads, 2)
-        self.assertEqual(p.job_size, 1048576)
-        self.assertEqual(p.overlap_log, 6)
-
-        p = zstd.ZstdCompressionParameters(compression_level=-1)
-        self.assertEqual(p.compression_level, -1)
-
-        p = zstd.ZstdCompressionParameters(compression_level=-2)
-        self.assertEqual(p.compression_level, -2)
+        for kwargs in MEMBER_CASES:
+            with self.subTest(**kwargs):
+                p = zstd.ZstdCompressionParameters(**kwargs)
 
-        p = zstd.ZstdCompressionParameters(force_max_window=True)
-        self.assertEqual(p.force_max_window, 1)
-
-        p = zstd.ZstdCompressionParameters(enable_ldm=True)
-        self.assertEqual(p.enable_ldm, 1)
-
-        p = zstd.ZstdCompressionParameters(ldm_hash_log=7)
-        self.assertEqual(p.ldm_hash_log, 7)
-
-        p = zstd.ZstdCompressionParameters(ldm_min_match=6)
-        self.assertEqual(p.ldm_min_match, 6)
-
-        p = zstd.ZstdCompressionParameters(ldm_bucket_size_log=7)
-        self.assertEqual(p.ldm_bucket_size_log, 7)
-
-        p = zstd.ZstdCompressionParameters(ldm_hash_rate_log=8)
-        self.assertEqual(p.ldm_hash_rate_log, 8)
+                for attr, value in kwargs.items():
+                    self.assertEqual(getattr(p, attr), value)
 
     def test_estimated_compression_context_size(self):
         p = zstd.ZstdCompressionParameters(
@@ -101,8 +112,9 @@ class TestCompressionParameters(unittest.TestCase):
         )
 
         # 32-bit has slightly different values from 64-bit.
-        self.assertAlmostEqual(
-            p.estimated_compression_context_size(), 1297424, delta=2000
+        self.assertIn(
+            p.estimated_compression_context_size(),
+            range(1297424 - 2000, 1297424 + 2001),
         )
 
     def test_strategy(self):
@@ -145,66 +157,19 @@ class TestFrameParameters(unittest.TestCase):
             zstd.get_frame_parameters(b"foobarbaz")
 
     def test_attributes(self):
-        params = zstd.get_frame_parameters(zstd.FRAME_HEADER + b"\x00\x00")
-        self.assertEqual(params.content_size, zstd.CONTENTSIZE_UNKNOWN)
-        self.assertEqual(params.window_size, 1024)
-        self.assertEqual(params.dict_id, 0)
-        self.assertFalse(params.has_checksum)
-
-        # Lowest 2 bits indicate a dictionary and length. Here, the dict id is 1 byte.
-        params = zstd.get_frame_parameters(zstd.FRAME_HEADER + b"\x01\x00\xff")
-        self.assertEqual(params.content_size, zstd.CONTENTSIZE_UNKNOWN)
-        self.assertEqual(params.window_size, 1024)
-        self.assertEqual(params.dict_id, 255)
-        self.assertFalse(params.has_checksum)
-
-        # Lowest 3rd bit indicates if checksum is present.
-        params = zstd.get_frame_parameters(zstd.FRAME_HEADER + b"\x04\x00")
-        self.assertEqual(params.content_size, zstd.CONTENTSIZE_UNKNOWN)
-        self.assertEqual(params.window_size, 1024)
-        self.assertEqual(params.dict_id, 0)
-        self.assertTrue(params.has_checksum)
-
-        # Upper 2 bits indicate content size.
-        params = zstd.get_frame_parameters(
-            zstd.FRAME_HEADER + b"\x40\x00\xff\x00"
-        )
-        self.assertEqual(params.content_size, 511)
-        self.assertEqual(params.window_size, 1024)
-        self.assertEqual(params.dict_id, 0)
-        self.assertFalse(params.has_checksum)
-
-        # Window descriptor is 2nd byte after frame header.
-        params = zstd.get_frame_parameters(zstd.FRAME_HEADER + b"\x00\x40")
-        self.assertEqual(params.content_size, zstd.CONTENTSIZE_UNKNOWN)
-        self.assertEqual(params.window_size, 262144)
-        self.assertEqual(params.dict_id, 0)
-        self.assertFalse(params.has_checksum)
-
-        # Set multiple things.
-        params = zstd.get_frame_parameters(
-            zstd.FRAME_HEADER + b"\x45\x40\x0f\x10\x00"
-        )
-        self.assertEqual(params.content_size, 272)
-        self.assertEqual(params.window_size, 262144)
-        self.assertEqual(params.dict_id, 15)
-        self.assertTrue(params.has_checksum)
+        for header, kwargs in HEADER_CASES:
+            with self.subTest(header=header):
+                assert_frame_parameters(self, header, **kwargs)
 
     def test_input_types(self):
-        v = zstd.FRAME_HEADER + b"\x00\x00"
-
-        mutable_array = bytearray(len(v))
-        mutable_array[:] = v
+        mutable_array = bytearray(HEADER_EMPTY)
 
+        # Read-only view, mutable buffer and a writable view of that buffer.
         sources = [
-            memoryview(v),
-            bytearray(v),
+            memoryview(HEADER_EMPTY),
             mutable_array,
+            memoryview(mutable_array),
         ]
 
         for source in sources:
-            params = zstd.get_frame_parameters(source)
-            self.assertEqual(params.content_size, zstd.CONTENTSIZE_UNKNOWN)
-            self.assertEqual(params.window_size, 1024)
-            self.assertEqual(params.dict_id, 0)
-            self.assertFalse(params.has_checksum)
+            assert_frame_parameters(self, source, window_size=1024)
@@ -9,6 +9,8 @@ except ImportError:
 
 import zstandard as zstd
 
+# Registers and loads the Hypothesis settings profiles.
+from . import common  # noqa: F401
 
 s_windowlog = strategies.integers(
     min_value=zstd.WINDOWLOG_MIN, max_value=zstd.WINDOWLOG_MAX
@@ -45,6 +47,8 @@ s_strategy = strategies.sampled_from(
 
 @unittest.skipUnless("ZSTD_SLOW_TESTS" in os.environ, "ZSTD_SLOW_TESTS not set")
 class TestCompressionParametersHypothesis(unittest.TestCase):
+    # Examples are cheap, so don't bother timing them.
+    @hypothesis.settings(deadline=None)
     @hypothesis.given(
         s_windowlog,
         s_chainlog,
@@ -74,6 +78,7 @@ class TestCompressionParametersHypothesis(unittest.TestCase):
             strategy=strategy,
         )
 
+    @hypothesis.settings(deadline=None)
     @hypothesis.given(
         s_windowlog,
         s_chainlog,
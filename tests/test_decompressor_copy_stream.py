@@ -1,5 +1,4 @@
 import io
-import struct
 import unittest
 
 import zstandard as zstd
@@ -8,6 +7,9 @@ from .common import (
     CustomBytesIO,
 )
 
+# Decompresses to several multiples of the default output chunk size.
+LARGE_DATA = bytes(range(256)) * 1024
+
 
 class TestDecompressor_copy_stream(unittest.TestCase):
     def test_no_read(self):
@@ -39,22 +41,15 @@ class TestDecompressor_copy_stream(unittest.TestCase):
         self.assertEqual(dest.getvalue(), b"")
 
     def test_large_data(self):
-        source = io.BytesIO()
-        for i in range(255):
-            source.write(struct.Struct(">B").pack(i) * 16384)
-        source.seek(0)
-
-        compressed = io.BytesIO()
-        cctx = zstd.ZstdCompressor()
-        cctx.copy_stream(source, compressed)
+        compressed = zstd.ZstdCompressor().compress(LARGE_DATA)
 
-        compressed.seek(0)
         dest = io.BytesIO()
         dctx = zstd.ZstdDecompressor()
-        r, w = dctx.copy_stream(compressed, dest)
+        r, w = dctx.copy_stream(io.BytesIO(compressed), dest)
 
-        self.assertEqual(r, len(compressed.getvalue()))
-        self.assertEqual(w, len(source.getvalue()))
+        self.assertEqual(r, len(compressed))
+        self.assertEqual(w, len(LARGE_DATA))
+        self.assertEqual(dest.getbuffer(), LARGE_DATA)
 
     def test_read_write_size(self):
         source = CustomBytesIO(zstd.ZstdCompressor().compress(b"foobarfoobar"))
@@ -4,8 +4,33 @@ import zstandard as zstd
 
 
 class TestDecompressor_decompress(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        samples = []
+        for i in range(128):
+            samples.append(b"foo" * 64)
+            samples.append(b"bar" * 64)
+            samples.append(b"foobar" * 64)
+            samples.append(b"qwert" * 64)
+            samples.append(b"yuiop" * 64)
+            samples.append(b"asdfg" * 64)
+            samples.append(b"hijkl" * 64)
+
+        # Dictionary training dwarfs the cost of the decompression being
+        # tested.
+        cls.dict_8k = zstd.train_dictionary(8192, samples)
+
+        # Compressors for producing test frames.
+        cls.cctx = zstd.ZstdCompressor()
+        cls.cctx_level1 = zstd.ZstdCompressor(level=1)
+        cls.cctx_no_size = zstd.ZstdCompressor(write_content_size=False)
+
+        # Every decompress() resets the decompression session, so tests that
+        # don't need special settings can share this.
+        cls.dctx = zstd.ZstdDecompressor()
+
     def test_empty_input(self):
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
         with self.assertRaisesRegex(
             zstd.ZstdError, "error determining content size from frame header"
@@ -13,7 +38,7 @@ class TestDecompressor_decompress(unittest.TestCase):
             dctx.decompress(b"")
 
     def test_invalid_input(self):
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
         with self.assertRaisesRegex(
             zstd.ZstdError, "error determining content size from frame header"
@@ -21,55 +46,55 @@ class TestDecompressor_decompress(unittest.TestCase):
             dctx.decompress(b"foobar")
 
     def test_input_types(self):
-        cctx = zstd.ZstdCompressor(level=1)
+        cctx = self.cctx_level1
         compressed = cctx.compress(b"foo")
 
-        mutable_array = bytearray(len(compressed))
-        mutable_array[:] = compressed
+        mutable_array = bytearray(compressed)
 
+        # Read-only view, mutable buffer and a writable view of that buffer.
         sources = [
             memoryview(compressed),
-            bytearray(compressed),
             mutable_array,
+            memoryview(mutable_array),
         ]
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         for source in sources:
             self.assertEqual(dctx.decompress(source), b"foo")
 
     def test_no_content_size_in_frame(self):
-        cctx = zstd.ZstdCompressor(write_content_size=False)
+        cctx = self.cctx_no_size
         compressed = cctx.compress(b"foobar")
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         with self.assertRaisesRegex(
             zstd.ZstdError, "could not determine content size in frame header"
         ):
             dctx.decompress(compressed)
 
     def test_content_size_present(self):
-        cctx = zstd.ZstdCompressor()
+        cctx = self.cctx
         compressed = cctx.compress(b"foobar")
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         decompressed = dctx.decompress(compressed)
         self.assertEqual(decompressed, b"foobar")
 
     def test_empty_roundtrip(self):
-        cctx = zstd.ZstdCompressor()
+        cctx = self.cctx
         compressed = cctx.compress(b"")
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         decompressed = dctx.decompress(compressed)
 
         self.assertEqual(decompressed, b"")
 
     def test_max_output_size(self):
-        cctx = zstd.ZstdCompressor(write_content_size=False)
+        cctx = self.cctx_no_size
         source = b"foobar" * 256
         compressed = cctx.compress(source)
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         # Will fit into buffer exactly the size of input.
         decompressed = dctx.decompress(compressed, max_output_size=len(source))
         self.assertEqual(decompressed, source)
@@ -93,9 +118,9 @@ class TestDecompressor_decompress(unittest.TestCase):
         self.assertEqual(decompressed, source)
 
     def test_stupidly_large_output_buffer(self):
-        cctx = zstd.ZstdCompressor(write_content_size=False)
+        cctx = self.cctx_no_size
         compressed = cctx.compress(b"foobar" * 256)
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
         # Will get OverflowError on some Python distributions that can't
         # handle really large integers.
@@ -103,17 +128,7 @@ class TestDecompressor_decompress(unittest.TestCase):
             dctx.decompress(compressed, max_output_size=2 ** 62)
 
     def test_dictionary(self):
-        samples = []
-        for i in range(128):
-            samples.append(b"foo" * 64)
-            samples.append(b"bar" * 64)
-            samples.append(b"foobar" * 64)
-            samples.append(b"qwert" * 64)
-            samples.append(b"yuiop" * 64)
-            samples.append(b"asdfg" * 64)
-            samples.append(b"hijkl" * 64)
-
-        d = zstd.train_dictionary(8192, samples)
+        d = self.dict_8k
 
         orig = b"foobar" * 16384
         cctx = zstd.ZstdCompressor(level=1, dict_data=d)
@@ -125,17 +140,7 @@ class TestDecompressor_decompress(unittest.TestCase):
         self.assertEqual(decompressed, orig)
 
     def test_dictionary_multiple(self):
-        samples = []
-        for i in range(128):
-            samples.append(b"foo" * 64)
-            samples.append(b"bar" * 64)
-            samples.append(b"foobar" * 64)
-            samples.append(b"qwert" * 64)
-            samples.append(b"yuiop" * 64)
-            samples.append(b"asdfg" * 64)
-            samples.append(b"hijkl" * 64)
-
-        d = zstd.train_dictionary(8192, samples)
+        d = self.dict_8k
 
         sources = (b"foobar" * 8192, b"foo" * 8192, b"bar" * 8192)
         compressed = []
@@ -154,7 +159,7 @@ class TestDecompressor_decompress(unittest.TestCase):
 
         # If we write a content size, the decompressor engages single pass
         # mode and the window size doesn't come into play.
-        cctx = zstd.ZstdCompressor(write_content_size=False)
+        cctx = self.cctx_no_size
         frame = cctx.compress(source)
 
         dctx = zstd.ZstdDecompressor(max_window_size=2 ** zstd.WINDOWLOG_MIN)
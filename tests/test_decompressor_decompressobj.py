@@ -4,10 +4,19 @@ import zstandard as zstd
 
 
 class TestDecompressor_decompressobj(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Compressor for producing test frames.
+        cls.cctx = zstd.ZstdCompressor(level=1)
+
+        # Every decompressobj() resets the decompression session, so tests
+        # can share this.
+        cls.dctx = zstd.ZstdDecompressor()
+
     def test_simple(self):
-        data = zstd.ZstdCompressor(level=1).compress(b"foobar")
+        data = self.cctx.compress(b"foobar")
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         dobj = dctx.decompressobj()
         self.assertEqual(dobj.decompress(data), b"foobar")
         self.assertEqual(dobj.flush(), b"")
@@ -15,17 +24,17 @@ class TestDecompressor_decompressobj(unittest.TestCase):
         self.assertEqual(dobj.flush(length=100), b"")
 
     def test_input_types(self):
-        compressed = zstd.ZstdCompressor(level=1).compress(b"foo")
+        compressed = self.cctx.compress(b"foo")
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
-        mutable_array = bytearray(len(compressed))
-        mutable_array[:] = compressed
+        mutable_array = bytearray(compressed)
 
+        # Read-only view, mutable buffer and a writable view of that buffer.
         sources = [
             memoryview(compressed),
-            bytearray(compressed),
             mutable_array,
+            memoryview(mutable_array),
         ]
 
         for source in sources:
@@ -37,9 +46,9 @@ class TestDecompressor_decompressobj(unittest.TestCase):
             self.assertEqual(dobj.flush(), b"")
 
     def test_reuse(self):
-        data = zstd.ZstdCompressor(level=1).compress(b"foobar")
+        data = self.cctx.compress(b"foobar")
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         dobj = dctx.decompressobj()
         dobj.decompress(data)
 
@@ -50,17 +59,19 @@ class TestDecompressor_decompressobj(unittest.TestCase):
             self.assertEqual(dobj.flush(), b"")
 
     def test_bad_write_size(self):
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
         with self.assertRaisesRegex(ValueError, "write_size must be positive"):
             dctx.decompressobj(write_size=0)
 
     def test_write_size(self):
         source = b"foo" * 64 + b"bar" * 128
-        data = zstd.ZstdCompressor(level=1).compress(source)
+        data = self.cctx.compress(source)
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
-        for i in range(128):
-            dobj = dctx.decompressobj(write_size=i + 1)
-            self.assertEqual(dobj.decompress(data), source)
+        # Sizes on either side of powers of 2 cover the output chunking.
+        for write_size in (1, 2, 3, 4, 7, 8, 15, 16, 31, 32, 63, 64, 127, 128):
+            with self.subTest(write_size=write_size):
+                dobj = dctx.decompressobj(write_size=write_size)
+                self.assertEqual(dobj.decompress(data), source)
@@ -10,7 +10,10 @@ except ImportError:
 
 import zstandard as zstd
 
-from .common import random_input_data
+from .common import (
+    assert_chunks_equal,
+    random_input_strategy,
+)
 
 
 @unittest.skipUnless("ZSTD_SLOW_TESTS" in os.environ, "ZSTD_SLOW_TESTS not set")
@@ -22,7 +25,7 @@ class TestDecompressor_stream_reader_fuzzing(unittest.TestCase):
         ]
     )
     @hypothesis.given(
-        original=strategies.sampled_from(random_input_data()),
+        original=random_input_strategy(),
         level=strategies.integers(min_value=1, max_value=5),
         streaming=strategies.booleans(),
         source_read_size=strategies.integers(1, 1048576),
@@ -55,14 +58,14 @@ class TestDecompressor_stream_reader_fuzzing(unittest.TestCase):
 
                 chunks.append(chunk)
 
-        self.assertEqual(b"".join(chunks), original)
+        assert_chunks_equal(self, chunks, original)
 
     # Similar to above except we have a constant read() size.
     @hypothesis.settings(
         suppress_health_check=[hypothesis.HealthCheck.large_base_example]
     )
     @hypothesis.given(
-        original=strategies.sampled_from(random_input_data()),
+        original=random_input_strategy(),
         level=strategies.integers(min_value=1, max_value=5),
         streaming=strategies.booleans(),
         source_read_size=strategies.integers(1, 1048576),
@@ -97,7 +100,7 @@ class TestDecompressor_stream_reader_fuzzing(unittest.TestCase):
 
             chunks.append(chunk)
 
-        self.assertEqual(b"".join(chunks), original)
+        assert_chunks_equal(self, chunks, original)
 
     @hypothesis.settings(
         suppress_health_check=[
@@ -106,7 +109,7 @@ class TestDecompressor_stream_reader_fuzzing(unittest.TestCase):
         ]
     )
     @hypothesis.given(
-        original=strategies.sampled_from(random_input_data()),
+        original=random_input_strategy(),
         level=strategies.integers(min_value=1, max_value=5),
         streaming=strategies.booleans(),
         source_read_size=strategies.integers(1, 1048576),
@@ -138,14 +141,14 @@ class TestDecompressor_stream_reader_fuzzing(unittest.TestCase):
 
                 chunks.append(chunk)
 
-        self.assertEqual(b"".join(chunks), original)
+        assert_chunks_equal(self, chunks, original)
 
     # Similar to above except we have a constant read() size.
     @hypothesis.settings(
         suppress_health_check=[hypothesis.HealthCheck.large_base_example]
     )
     @hypothesis.given(
-        original=strategies.sampled_from(random_input_data()),
+        original=random_input_strategy(),
         level=strategies.integers(min_value=1, max_value=5),
         streaming=strategies.booleans(),
         source_read_size=strategies.integers(1, 1048576),
@@ -179,13 +182,13 @@ class TestDecompressor_stream_reader_fuzzing(unittest.TestCase):
 
             chunks.append(chunk)
 
-        self.assertEqual(b"".join(chunks), original)
+        assert_chunks_equal(self, chunks, original)
 
     @hypothesis.settings(
         suppress_health_check=[hypothesis.HealthCheck.large_base_example]
     )
     @hypothesis.given(
-        original=strategies.sampled_from(random_input_data()),
+        original=random_input_strategy(),
         level=strategies.integers(min_value=1, max_value=5),
         streaming=strategies.booleans(),
         source_read_size=strategies.integers(1, 1048576),
@@ -217,7 +220,7 @@ class TestDecompressor_stream_reader_fuzzing(unittest.TestCase):
         ]
     )
     @hypothesis.given(
-        original=strategies.sampled_from(random_input_data()),
+        original=random_input_strategy(),
         level=strategies.integers(min_value=1, max_value=5),
         streaming=strategies.booleans(),
         source_read_size=strategies.integers(1, 1048576),
@@ -250,7 +253,7 @@ class TestDecompressor_stream_reader_fuzzing(unittest.TestCase):
 
                 chunks.append(chunk)
 
-        self.assertEqual(b"".join(chunks), original)
+        assert_chunks_equal(self, chunks, original)
 
     @hypothesis.settings(
         suppress_health_check=[
@@ -259,7 +262,7 @@ class TestDecompressor_stream_reader_fuzzing(unittest.TestCase):
         ]
     )
     @hypothesis.given(
-        original=strategies.sampled_from(random_input_data()),
+        original=random_input_strategy(),
         level=strategies.integers(min_value=1, max_value=5),
         streaming=strategies.booleans(),
         source_read_size=strategies.integers(1, 1048576),
@@ -294,7 +297,7 @@ class TestDecompressor_stream_reader_fuzzing(unittest.TestCase):
 
                 chunks.append(bytes(b[0:count]))
 
-        self.assertEqual(b"".join(chunks), original)
+        assert_chunks_equal(self, chunks, original)
 
     @hypothesis.settings(
         suppress_health_check=[
@@ -303,7 +306,7 @@ class TestDecompressor_stream_reader_fuzzing(unittest.TestCase):
         ]
     )
     @hypothesis.given(
-        original=strategies.sampled_from(random_input_data()),
+        original=random_input_strategy(),
         level=strategies.integers(min_value=1, max_value=5),
         source_read_size=strategies.integers(1, 1048576),
         seek_amounts=strategies.data(),
@@ -354,7 +357,7 @@ class TestDecompressor_stream_reader_fuzzing(unittest.TestCase):
         writer = cctx.stream_writer(buffer)
 
         for i in range(frame_count):
-            data = originals.draw(strategies.sampled_from(random_input_data()))
+            data = originals.draw(random_input_strategy())
             source.write(data)
             writer.write(data)
             writer.flush(zstd.FLUSH_FRAME)
@@ -388,7 +391,7 @@ class TestDecompressor_stream_writer_fuzzing(unittest.TestCase):
         ]
     )
     @hypothesis.given(
-        original=strategies.sampled_from(random_input_data()),
+        original=random_input_strategy(),
         level=strategies.integers(min_value=1, max_value=5),
         write_size=strategies.integers(min_value=1, max_value=8192),
         input_sizes=strategies.data(),
@@ -426,7 +429,7 @@ class TestDecompressor_copy_stream_fuzzing(unittest.TestCase):
         ]
     )
     @hypothesis.given(
-        original=strategies.sampled_from(random_input_data()),
+        original=random_input_strategy(),
         level=strategies.integers(min_value=1, max_value=5),
         read_size=strategies.integers(min_value=1, max_value=8192),
         write_size=strategies.integers(min_value=1, max_value=8192),
@@ -457,7 +460,7 @@ class TestDecompressor_decompressobj_fuzzing(unittest.TestCase):
         ]
     )
     @hypothesis.given(
-        original=strategies.sampled_from(random_input_data()),
+        original=random_input_strategy(),
         level=strategies.integers(min_value=1, max_value=5),
         chunk_sizes=strategies.data(),
     )
@@ -479,7 +482,7 @@ class TestDecompressor_decompressobj_fuzzing(unittest.TestCase):
 
             chunks.append(dobj.decompress(chunk))
 
-        self.assertEqual(b"".join(chunks), original)
+        assert_chunks_equal(self, chunks, original)
 
     @hypothesis.settings(
         suppress_health_check=[
@@ -488,7 +491,7 @@ class TestDecompressor_decompressobj_fuzzing(unittest.TestCase):
         ]
     )
     @hypothesis.given(
-        original=strategies.sampled_from(random_input_data()),
+        original=random_input_strategy(),
         level=strategies.integers(min_value=1, max_value=5),
         write_size=strategies.integers(
             min_value=1,
@@ -516,13 +519,13 @@ class TestDecompressor_decompressobj_fuzzing(unittest.TestCase):
 
             chunks.append(dobj.decompress(chunk))
 
-        self.assertEqual(b"".join(chunks), original)
+        assert_chunks_equal(self, chunks, original)
 
 
 @unittest.skipUnless("ZSTD_SLOW_TESTS" in os.environ, "ZSTD_SLOW_TESTS not set")
 class TestDecompressor_read_to_iter_fuzzing(unittest.TestCase):
     @hypothesis.given(
-        original=strategies.sampled_from(random_input_data()),
+        original=random_input_strategy(),
         level=strategies.integers(min_value=1, max_value=5),
         read_size=strategies.integers(min_value=1, max_value=4096),
         write_size=strategies.integers(min_value=1, max_value=4096),
@@ -536,13 +539,11 @@ class TestDecompressor_read_to_iter_fuzzing(unittest.TestCase):
         source = io.BytesIO(frame)
 
         dctx = zstd.ZstdDecompressor()
-        chunks = list(
-            dctx.read_to_iter(
-                source, read_size=read_size, write_size=write_size
-            )
+        chunks = dctx.read_to_iter(
+            source, read_size=read_size, write_size=write_size
         )
 
-        self.assertEqual(b"".join(chunks), original)
+        assert_chunks_equal(self, chunks, original)
 
 
 @unittest.skipUnless("ZSTD_SLOW_TESTS" in os.environ, "ZSTD_SLOW_TESTS not set")
@@ -553,7 +554,7 @@ class TestDecompressor_read_to_iter_fuzzing(unittest.TestCase):
 class TestDecompressor_multi_decompress_to_buffer_fuzzing(unittest.TestCase):
     @hypothesis.given(
         original=strategies.lists(
-            strategies.sampled_from(random_input_data()),
+            random_input_strategy(),
             min_size=1,
             max_size=1024,
         ),
@@ -9,6 +9,19 @@ from .common import (
 )
 
 
+def make_buffer_with_segments(chunks):
+    """Build a BufferWithSegments holding ``chunks`` back to back."""
+    segments = []
+    offset = 0
+    for chunk in chunks:
+        segments.extend((offset, len(chunk)))
+        offset += len(chunk)
+
+    return zstd.BufferWithSegments(
+        b"".join(chunks), struct.pack("=%dQ" % len(segments), *segments)
+    )
+
+
 @unittest.skipUnless(
     "multi_decompress_to_buffer" in zstd.backend_features,
     "multi_decompress_to_buffer feature not available",
@@ -80,10 +93,7 @@ class TestDecompressor_multi_decompress_to_buffer(unittest.TestCase):
 
         dctx = zstd.ZstdDecompressor()
 
-        segments = struct.pack(
-            "=QQQQ", 0, len(frames[0]), len(frames[0]), len(frames[1])
-        )
-        b = zstd.BufferWithSegments(b"".join(frames), segments)
+        b = make_buffer_with_segments(frames)
 
         result = dctx.multi_decompress_to_buffer(b)
 
@@ -100,16 +110,7 @@ class TestDecompressor_multi_decompress_to_buffer(unittest.TestCase):
 
         dctx = zstd.ZstdDecompressor()
 
-        segments = struct.pack(
-            "=QQQQQQ",
-            0,
-            len(frames[0]),
-            len(frames[0]),
-            len(frames[1]),
-            len(frames[0]) + len(frames[1]),
-            len(frames[2]),
-        )
-        b = zstd.BufferWithSegments(b"".join(frames), segments)
+        b = make_buffer_with_segments(frames)
 
         result = dctx.multi_decompress_to_buffer(b, decompressed_sizes=sizes)
 
@@ -143,29 +144,8 @@ class TestDecompressor_multi_decompress_to_buffer(unittest.TestCase):
             self.assertEqual(data, decompressed[i].tobytes())
 
         # And a manual mode.
-        b = b"".join([frames[0].tobytes(), frames[1].tobytes()])
-        b1 = zstd.BufferWithSegments(
-            b,
-            struct.pack(
-                "=QQQQ", 0, len(frames[0]), len(frames[0]), len(frames[1])
-            ),
-        )
-
-        b = b"".join(
-            [frames[2].tobytes(), frames[3].tobytes(), frames[4].tobytes()]
-        )
-        b2 = zstd.BufferWithSegments(
-            b,
-            struct.pack(
-                "=QQQQQQ",
-                0,
-                len(frames[2]),
-                len(frames[2]),
-                len(frames[3]),
-                len(frames[2]) + len(frames[3]),
-                len(frames[4]),
-            ),
-        )
+        b1 = make_buffer_with_segments([frames[i].tobytes() for i in (0, 1)])
+        b2 = make_buffer_with_segments([frames[i].tobytes() for i in (2, 3, 4)])
 
         c = zstd.BufferWithSegmentsCollection(b1, b2)
 
@@ -182,7 +162,7 @@ class TestDecompressor_multi_decompress_to_buffer(unittest.TestCase):
         d = zstd.train_dictionary(optSize, samples, k=64, d=8)
 
         cctx = zstd.ZstdCompressor(dict_data=d, level=1)
-        frames = [cctx.compress(s) for s in generate_samples()]
+        frames = [cctx.compress(s) for s in samples]
 
         dctx = zstd.ZstdDecompressor(dict_data=d)
 
@@ -1,7 +1,6 @@
 import io
 import os
 import random
-import struct
 import unittest
 
 import zstandard as zstd
@@ -12,8 +11,17 @@ from .common import (
 
 
 class TestDecompressor_read_to_iter(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Every compress() and stream_writer() resets the compression
+        # session, so tests can share this compressor.
+        cls.cctx_level1 = zstd.ZstdCompressor(level=1)
+
+        # Likewise for read_to_iter() and the decompression session.
+        cls.dctx = zstd.ZstdDecompressor()
+
     def test_type_validation(self):
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
         # Object with read() works.
         dctx.read_to_iter(io.BytesIO())
@@ -27,7 +35,7 @@ class TestDecompressor_read_to_iter(unittest.TestCase):
             b"".join(dctx.read_to_iter(True))
 
     def test_empty_input(self):
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
         source = io.BytesIO()
         it = dctx.read_to_iter(source)
@@ -40,7 +48,7 @@ class TestDecompressor_read_to_iter(unittest.TestCase):
             next(it)
 
     def test_invalid_input(self):
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
         source = io.BytesIO(b"foobar")
         it = dctx.read_to_iter(source)
@@ -58,7 +66,7 @@ class TestDecompressor_read_to_iter(unittest.TestCase):
         source = io.BytesIO(empty)
         source.seek(0)
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         it = dctx.read_to_iter(source)
 
         # No chunks should be emitted since there is no data.
@@ -70,7 +78,7 @@ class TestDecompressor_read_to_iter(unittest.TestCase):
             next(it)
 
     def test_skip_bytes_too_large(self):
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
         with self.assertRaisesRegex(
             ValueError, "skip_bytes must be smaller than read_size"
@@ -86,7 +94,7 @@ class TestDecompressor_read_to_iter(unittest.TestCase):
         cctx = zstd.ZstdCompressor(write_content_size=False)
         compressed = cctx.compress(b"foobar")
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         output = b"".join(dctx.read_to_iter(b"hdr" + compressed, skip_bytes=3))
         self.assertEqual(output, b"foobar")
 
@@ -96,50 +104,42 @@ class TestDecompressor_read_to_iter(unittest.TestCase):
         source.write(b"o")
         source.seek(0)
 
-        cctx = zstd.ZstdCompressor(level=1)
+        cctx = self.cctx_level1
         compressed = io.BytesIO(cctx.compress(source.getvalue()))
         compressed.seek(0)
 
-        dctx = zstd.ZstdDecompressor()
-        it = dctx.read_to_iter(compressed)
-
-        chunks = []
-        chunks.append(next(it))
-        chunks.append(next(it))
-
-        with self.assertRaises(StopIteration):
-            next(it)
-
-        decompressed = b"".join(chunks)
-        self.assertEqual(decompressed, source.getvalue())
+        dctx = self.dctx
 
-        # And again with buffer protocol.
-        it = dctx.read_to_iter(compressed.getvalue())
-        chunks = []
-        chunks.append(next(it))
-        chunks.append(next(it))
+        # Read from the stream, then from a buffer protocol object.
+        for frame in (compressed, compressed.getvalue()):
+            with self.subTest(source_type=type(frame).__name__):
+                it = dctx.read_to_iter(frame)
+                chunks = [next(it), next(it)]
 
-        with self.assertRaises(StopIteration):
-            next(it)
+                with self.assertRaises(StopIteration):
+                    next(it)
 
-        decompressed = b"".join(chunks)
-        self.assertEqual(decompressed, source.getvalue())
+                decompressed = b"".join(chunks)
+                self.assertEqual(decompressed, source.getvalue())
 
     @unittest.skipUnless(
         "ZSTD_SLOW_TESTS" in os.environ, "ZSTD_SLOW_TESTS not set"
     )
     def test_large_input(self):
-        bytes = list(struct.Struct(">B").pack(i) for i in range(256))
+        # Incompressible input, written in chunks. A fixed seed keeps the
+        # input identical across runs.
+        rng = random.Random(0)
         compressed = io.BytesIO()
         input_size = 0
-        cctx = zstd.ZstdCompressor(level=1)
+        cctx = self.cctx_level1
         with cctx.stream_writer(compressed, closefd=False) as compressor:
             while True:
-                compressor.write(random.choice(bytes))
-                input_size += 1
+                chunk = rng.getrandbits(65536 * 8).to_bytes(65536, "little")
+                compressor.write(chunk)
+                input_size += len(chunk)
 
                 have_compressed = (
-                    len(compressed.getvalue())
+                    compressed.tell()
                     > zstd.DECOMPRESSION_RECOMMENDED_INPUT_SIZE
                 )
                 have_raw = (
@@ -148,43 +148,28 @@ class TestDecompressor_read_to_iter(unittest.TestCase):
                 if have_compressed and have_raw:
                     break
 
-        compressed = io.BytesIO(compressed.getvalue())
+        compressed = compressed.getvalue()
         self.assertGreater(
-            len(compressed.getvalue()),
-            zstd.DECOMPRESSION_RECOMMENDED_INPUT_SIZE,
+            len(compressed), zstd.DECOMPRESSION_RECOMMENDED_INPUT_SIZE
         )
 
-        dctx = zstd.ZstdDecompressor()
-        it = dctx.read_to_iter(compressed)
+        dctx = self.dctx
 
-        chunks = []
-        chunks.append(next(it))
-        chunks.append(next(it))
-        chunks.append(next(it))
+        # Read from the stream, then from a buffer protocol object.
+        for frame in (io.BytesIO(compressed), compressed):
+            with self.subTest(source_type=type(frame).__name__):
+                it = dctx.read_to_iter(frame)
+                chunks = [next(it), next(it), next(it)]
 
-        with self.assertRaises(StopIteration):
-            next(it)
-
-        decompressed = b"".join(chunks)
-        self.assertEqual(len(decompressed), input_size)
-
-        # And again with buffer protocol.
-        it = dctx.read_to_iter(compressed.getvalue())
-
-        chunks = []
-        chunks.append(next(it))
-        chunks.append(next(it))
-        chunks.append(next(it))
+                with self.assertRaises(StopIteration):
+                    next(it)
 
-        with self.assertRaises(StopIteration):
-            next(it)
-
-        decompressed = b"".join(chunks)
-        self.assertEqual(len(decompressed), input_size)
+                decompressed = b"".join(chunks)
+                self.assertEqual(len(decompressed), input_size)
 
     def test_interesting(self):
         # Found this edge case via fuzzing.
-        cctx = zstd.ZstdCompressor(level=1)
+        cctx = self.cctx_level1
 
         source = io.BytesIO()
 
@@ -195,20 +180,20 @@ class TestDecompressor_read_to_iter(unittest.TestCase):
                 compressor.write(chunk)
                 source.write(chunk)
 
-        dctx = zstd.ZstdDecompressor()
+        source = source.getvalue()
+        compressed = compressed.getvalue()
 
-        simple = dctx.decompress(
-            compressed.getvalue(), max_output_size=len(source.getvalue())
-        )
-        self.assertEqual(simple, source.getvalue())
+        dctx = self.dctx
+
+        simple = dctx.decompress(compressed, max_output_size=len(source))
+        self.assertEqual(simple, source)
 
-        compressed = io.BytesIO(compressed.getvalue())
-        streamed = b"".join(dctx.read_to_iter(compressed))
-        self.assertEqual(streamed, source.getvalue())
+        streamed = b"".join(dctx.read_to_iter(io.BytesIO(compressed)))
+        self.assertEqual(streamed, source)
 
     def test_read_write_size(self):
         source = CustomBytesIO(zstd.ZstdCompressor().compress(b"foobarfoobar"))
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         for chunk in dctx.read_to_iter(source, read_size=1, write_size=1):
             self.assertEqual(len(chunk), 1)
 
@@ -223,7 +208,7 @@ class TestDecompressor_read_to_iter(unittest.TestCase):
 
         self.assertNotEqual(frame[0:4], b"\x28\xb5\x2f\xfd")
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         with self.assertRaisesRegex(
             zstd.ZstdError, "error determining content size from frame header"
         ):
@@ -1,5 +1,6 @@
 import io
 import os
+import random
 import unittest
 
 import zstandard as zstd
@@ -10,8 +11,22 @@ from .common import (
 
 
 class TestDecompressor_stream_reader(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Frames shared by tests that only read them.
+        cctx = zstd.ZstdCompressor()
+        cls.foo_frame = cctx.compress(b"foo")
+        cls.foo_60_frame = cctx.compress(b"foo" * 60)
+        cls.foobar_60_frame = cctx.compress(b"foobar" * 60)
+        cls.foo_bar_baz = b"".join([b"foo" * 60, b"bar" * 60, b"baz" * 60])
+        cls.foo_bar_baz_frame = cctx.compress(cls.foo_bar_baz)
+
+        # Every stream_reader() resets the decompression session, so one
+        # decompressor can serve all tests.
+        cls.dctx = zstd.ZstdDecompressor()
+
     def test_context_manager(self):
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
         with dctx.stream_reader(b"foo") as reader:
             with self.assertRaisesRegex(
@@ -21,7 +36,7 @@ class TestDecompressor_stream_reader(unittest.TestCase):
                     pass
 
     def test_not_implemented(self):
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
         with dctx.stream_reader(b"foo") as reader:
             with self.assertRaises(io.UnsupportedOperation):
@@ -43,7 +58,7 @@ class TestDecompressor_stream_reader(unittest.TestCase):
                 reader.writelines([])
 
     def test_constant_methods(self):
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
         with dctx.stream_reader(b"foo") as reader:
             self.assertFalse(reader.closed)
@@ -58,7 +73,7 @@ class TestDecompressor_stream_reader(unittest.TestCase):
         self.assertTrue(reader.closed)
 
     def test_read_closed(self):
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
         with dctx.stream_reader(b"foo") as reader:
             reader.close()
@@ -67,10 +82,9 @@ class TestDecompressor_stream_reader(unittest.TestCase):
                 reader.read(1)
 
     def test_read_sizes(self):
-        cctx = zstd.ZstdCompressor()
-        foo = cctx.compress(b"foo")
+        foo = self.foo_frame
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
         with dctx.stream_reader(foo) as reader:
             with self.assertRaisesRegex(
@@ -81,35 +95,36 @@ class TestDecompressor_stream_reader(unittest.TestCase):
             self.assertEqual(reader.read(0), b"")
             self.assertEqual(reader.read(), b"foo")
 
-    def test_read_buffer(self):
-        cctx = zstd.ZstdCompressor()
+    def test_read(self):
+        source = self.foo_bar_baz
+        frame = self.foo_bar_baz_frame
 
-        source = b"".join([b"foo" * 60, b"bar" * 60, b"baz" * 60])
-        frame = cctx.compress(source)
-
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
-        with dctx.stream_reader(frame) as reader:
-            self.assertEqual(reader.tell(), 0)
+        for wrap in (bytes, io.BytesIO):
+            with self.subTest(source_type=wrap.__name__):
+                with dctx.stream_reader(wrap(frame)) as reader:
+                    self.assertEqual(reader.tell(), 0)
 
-            # We should get entire frame in one read.
-            result = reader.read(8192)
-            self.assertEqual(result, source)
-            self.assertEqual(reader.tell(), len(source))
+                    # We should get entire frame in one read.
+                    result = reader.read(8192)
+                    self.assertEqual(result, source)
+                    self.assertEqual(reader.tell(), len(source))
 
-            # Read after EOF should return empty bytes.
-            self.assertEqual(reader.read(1), b"")
-            self.assertEqual(reader.tell(), len(result))
+                    # Read after EOF should return empty bytes.
+                    self.assertEqual(reader.read(1), b"")
+                    self.assertEqual(reader.tell(), len(result))
+                    self.assertFalse(reader.closed)
 
-        self.assertTrue(reader.closed)
+                self.assertTrue(reader.closed)
 
     def test_read_buffer_small_chunks(self):
-        cctx = zstd.ZstdCompressor()
-        source = b"".join([b"foo" * 60, b"bar" * 60, b"baz" * 60])
-        frame = cctx.compress(source)
+        source = self.foo_bar_baz
+        frame = self.foo_bar_baz_frame
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         chunks = []
+        expected_tell = 0
 
         with dctx.stream_reader(frame, read_size=1) as reader:
             while True:
@@ -118,52 +133,29 @@ class TestDecompressor_stream_reader(unittest.TestCase):
                     break
 
                 chunks.append(chunk)
-                self.assertEqual(reader.tell(), sum(map(len, chunks)))
+                expected_tell += len(chunk)
+                self.assertEqual(reader.tell(), expected_tell)
 
         self.assertEqual(b"".join(chunks), source)
 
-    def test_read_stream(self):
-        cctx = zstd.ZstdCompressor()
-        source = b"".join([b"foo" * 60, b"bar" * 60, b"baz" * 60])
-        frame = cctx.compress(source)
-
-        dctx = zstd.ZstdDecompressor()
-        with dctx.stream_reader(io.BytesIO(frame)) as reader:
-            self.assertEqual(reader.tell(), 0)
-
-            chunk = reader.read(8192)
-            self.assertEqual(chunk, source)
-            self.assertEqual(reader.tell(), len(source))
-            self.assertEqual(reader.read(1), b"")
-            self.assertEqual(reader.tell(), len(source))
-            self.assertFalse(reader.closed)
-
-        self.assertTrue(reader.closed)
-
     def test_read_stream_small_chunks(self):
-        cctx = zstd.ZstdCompressor()
-        source = b"".join([b"foo" * 60, b"bar" * 60, b"baz" * 60])
-        frame = cctx.compress(source)
+        source = self.foo_bar_baz
+        frame = self.foo_bar_baz_frame
 
-        dctx = zstd.ZstdDecompressor()
-        chunks = []
+        dctx = self.dctx
 
+        # read_size controls how much is read from the source at a time.
+        # Single byte output reads are covered by
+        # test_read_buffer_small_chunks.
         with dctx.stream_reader(io.BytesIO(frame), read_size=1) as reader:
-            while True:
-                chunk = reader.read(1)
-                if not chunk:
-                    break
-
-                chunks.append(chunk)
-                self.assertEqual(reader.tell(), sum(map(len, chunks)))
-
-        self.assertEqual(b"".join(chunks), source)
+            self.assertEqual(reader.readall(), source)
+            self.assertEqual(reader.tell(), len(source))
 
     def test_close(self):
         foo = zstd.ZstdCompressor().compress(b"foo" * 1024)
 
         buffer = io.BytesIO(foo)
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         reader = dctx.stream_reader(buffer)
 
         reader.read(3)
@@ -213,7 +205,7 @@ class TestDecompressor_stream_reader(unittest.TestCase):
         foo = zstd.ZstdCompressor().compress(b"foo" * 1024)
 
         buffer = io.BytesIO(foo)
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         reader = dctx.stream_reader(buffer, closefd=False)
 
         reader.read(3)
@@ -260,10 +252,9 @@ class TestDecompressor_stream_reader(unittest.TestCase):
         self.assertTrue(reader.closed)
 
     def test_read_after_exit(self):
-        cctx = zstd.ZstdCompressor()
-        frame = cctx.compress(b"foo" * 60)
+        frame = self.foo_60_frame
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
         with dctx.stream_reader(frame) as reader:
             while reader.read(16):
@@ -275,10 +266,9 @@ class TestDecompressor_stream_reader(unittest.TestCase):
             reader.read(10)
 
     def test_illegal_seeks(self):
-        cctx = zstd.ZstdCompressor()
-        frame = cctx.compress(b"foo" * 60)
+        frame = self.foo_60_frame
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
         with dctx.stream_reader(frame) as reader:
             with self.assertRaisesRegex(
@@ -314,10 +304,9 @@ class TestDecompressor_stream_reader(unittest.TestCase):
 
     def test_seek(self):
         source = b"foobar" * 60
-        cctx = zstd.ZstdCompressor()
-        frame = cctx.compress(source)
+        frame = self.foobar_60_frame
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
         with dctx.stream_reader(frame) as reader:
             reader.seek(3)
@@ -328,10 +317,9 @@ class TestDecompressor_stream_reader(unittest.TestCase):
 
     def test_no_context_manager(self):
         source = b"foobar" * 60
-        cctx = zstd.ZstdCompressor()
-        frame = cctx.compress(source)
+        frame = self.foobar_60_frame
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         reader = dctx.stream_reader(frame)
 
         self.assertEqual(reader.read(6), b"foobar")
@@ -347,7 +335,7 @@ class TestDecompressor_stream_reader(unittest.TestCase):
 
     def test_read_after_error(self):
         source = io.BytesIO(b"")
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
         reader = dctx.stream_reader(source)
 
@@ -360,14 +348,20 @@ class TestDecompressor_stream_reader(unittest.TestCase):
 
     def test_partial_read(self):
         # Inspired by https://github.com/indygreg/python-zstandard/issues/71.
+        # Incompressible input forces many reads. A fixed seed keeps the
+        # input identical across runs.
+        source = (
+            random.Random(0).getrandbits(8000000).to_bytes(1000000, "little")
+        )
+
         buffer = io.BytesIO()
         cctx = zstd.ZstdCompressor()
         writer = cctx.stream_writer(buffer)
-        writer.write(bytearray(os.urandom(1000000)))
+        writer.write(bytearray(source))
         writer.flush(zstd.FLUSH_FRAME)
         buffer.seek(0)
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         reader = dctx.stream_reader(buffer)
 
         while True:
@@ -384,84 +378,42 @@ class TestDecompressor_stream_reader(unittest.TestCase):
         writer.write(b"bar")
         writer.flush(zstd.FLUSH_FRAME)
 
-        dctx = zstd.ZstdDecompressor()
-
-        reader = dctx.stream_reader(source.getvalue())
-        self.assertEqual(reader.read(2), b"fo")
-        self.assertEqual(reader.read(2), b"o")
-        self.assertEqual(reader.read(2), b"ba")
-        self.assertEqual(reader.read(2), b"r")
-
-        source.seek(0)
-        reader = dctx.stream_reader(source)
-        self.assertEqual(reader.read(2), b"fo")
-        self.assertEqual(reader.read(2), b"o")
-        self.assertEqual(reader.read(2), b"ba")
-        self.assertEqual(reader.read(2), b"r")
-
-        reader = dctx.stream_reader(source.getvalue())
-        self.assertEqual(reader.read(3), b"foo")
-        self.assertEqual(reader.read(3), b"bar")
-
-        source.seek(0)
-        reader = dctx.stream_reader(source)
-        self.assertEqual(reader.read(3), b"foo")
-        self.assertEqual(reader.read(3), b"bar")
-
-        reader = dctx.stream_reader(source.getvalue())
-        self.assertEqual(reader.read(4), b"foo")
-        self.assertEqual(reader.read(4), b"bar")
-
-        source.seek(0)
-        reader = dctx.stream_reader(source)
-        self.assertEqual(reader.read(4), b"foo")
-        self.assertEqual(reader.read(4), b"bar")
-
-        reader = dctx.stream_reader(source.getvalue())
-        self.assertEqual(reader.read(128), b"foo")
-        self.assertEqual(reader.read(128), b"bar")
-
-        source.seek(0)
-        reader = dctx.stream_reader(source)
-        self.assertEqual(reader.read(128), b"foo")
-        self.assertEqual(reader.read(128), b"bar")
-
-        # Now tests for reads spanning frames.
-        reader = dctx.stream_reader(source.getvalue(), read_across_frames=True)
-        self.assertEqual(reader.read(3), b"foo")
-        self.assertEqual(reader.read(3), b"bar")
-
-        source.seek(0)
-        reader = dctx.stream_reader(source, read_across_frames=True)
-        self.assertEqual(reader.read(3), b"foo")
-        self.assertEqual(reader.read(3), b"bar")
-
-        reader = dctx.stream_reader(source.getvalue(), read_across_frames=True)
-        self.assertEqual(reader.read(6), b"foobar")
-
-        source.seek(0)
-        reader = dctx.stream_reader(source, read_across_frames=True)
-        self.assertEqual(reader.read(6), b"foobar")
-
-        reader = dctx.stream_reader(source.getvalue(), read_across_frames=True)
-        self.assertEqual(reader.read(7), b"foobar")
-
-        source.seek(0)
-        reader = dctx.stream_reader(source, read_across_frames=True)
-        self.assertEqual(reader.read(7), b"foobar")
-
-        reader = dctx.stream_reader(source.getvalue(), read_across_frames=True)
-        self.assertEqual(reader.read(128), b"foobar")
-
-        source.seek(0)
-        reader = dctx.stream_reader(source, read_across_frames=True)
-        self.assertEqual(reader.read(128), b"foobar")
+        # (read size, read_across_frames, expected result of each read)
+        cases = [
+            (2, False, [b"fo", b"o", b"ba", b"r"]),
+            (3, False, [b"foo", b"bar"]),
+            (4, False, [b"foo", b"bar"]),
+            (128, False, [b"foo", b"bar"]),
+            # Reads spanning frames.
+            (3, True, [b"foo", b"bar"]),
+            (6, True, [b"foobar"]),
+            (7, True, [b"foobar"]),
+            (128, True, [b"foobar"]),
+        ]
+
+        dctx = self.dctx
+
+        for size, read_across_frames, expected in cases:
+            with self.subTest(size=size, read_across_frames=read_across_frames):
+                reader = dctx.stream_reader(
+                    source.getvalue(), read_across_frames=read_across_frames
+                )
+                self.assertEqual(
+                    [reader.read(size) for _ in expected], expected
+                )
+
+                source.seek(0)
+                reader = dctx.stream_reader(
+                    source, read_across_frames=read_across_frames
+                )
+                self.assertEqual(
+                    [reader.read(size) for _ in expected], expected
+                )
 
     def test_readinto(self):
-        cctx = zstd.ZstdCompressor()
-        foo = cctx.compress(b"foo")
+        foo = self.foo_frame
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
         # Attempting to readinto() a non-writable buffer fails.
         # The exact exception varies based on the backend.
@@ -490,10 +442,9 @@ class TestDecompressor_stream_reader(unittest.TestCase):
         self.assertEqual(b[:], b"fo")
 
     def test_readinto1(self):
-        cctx = zstd.ZstdCompressor()
-        foo = cctx.compress(b"foo")
+        foo = self.foo_frame
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
         reader = dctx.stream_reader(foo)
         with self.assertRaises(Exception):
@@ -520,19 +471,17 @@ class TestDecompressor_stream_reader(unittest.TestCase):
         self.assertEqual(b[:], b"fo")
 
     def test_readall(self):
-        cctx = zstd.ZstdCompressor()
-        foo = cctx.compress(b"foo")
+        foo = self.foo_frame
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         reader = dctx.stream_reader(foo)
 
         self.assertEqual(reader.readall(), b"foo")
 
     def test_read1(self):
-        cctx = zstd.ZstdCompressor()
-        foo = cctx.compress(b"foo")
+        foo = self.foo_frame
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
         b = CustomBytesIO(foo)
         reader = dctx.stream_reader(b)
@@ -553,13 +502,11 @@ class TestDecompressor_stream_reader(unittest.TestCase):
 
     def test_read_lines(self):
         cctx = zstd.ZstdCompressor()
-        source = b"\n".join(
-            ("line %d" % i).encode("ascii") for i in range(1024)
-        )
+        source = "\n".join("line %d" % i for i in range(1024)).encode("ascii")
 
         frame = cctx.compress(source)
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         reader = dctx.stream_reader(frame)
         tr = io.TextIOWrapper(reader, encoding="utf-8")
 
@@ -1,6 +1,5 @@
 import io
 import os
-import struct
 import tempfile
 import unittest
 
@@ -22,9 +21,22 @@ def decompress_via_writer(data):
 
 
 class TestDecompressor_stream_writer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Every stream_writer() resets the decompression session, so tests
+        # that don't need special settings can share these.
+        cls.cctx = zstd.ZstdCompressor()
+        cls.dctx = zstd.ZstdDecompressor()
+
+        samples = [b"foo" * 64, b"bar" * 64, b"foobar" * 64] * 128
+
+        # Dictionary training dwarfs the cost of the decompression being
+        # tested.
+        cls.dict_8k = zstd.train_dictionary(8192, samples)
+
     def test_io_api(self):
         buffer = io.BytesIO()
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         writer = dctx.stream_writer(buffer)
 
         self.assertFalse(writer.closed)
@@ -94,16 +106,16 @@ class TestDecompressor_stream_writer(unittest.TestCase):
 
     def test_fileno_file(self):
         with tempfile.TemporaryFile("wb") as tf:
-            dctx = zstd.ZstdDecompressor()
+            dctx = self.dctx
             writer = dctx.stream_writer(tf)
 
             self.assertEqual(writer.fileno(), tf.fileno())
 
     def test_close(self):
-        foo = zstd.ZstdCompressor().compress(b"foo")
+        foo = self.cctx.compress(b"foo")
 
         buffer = NonClosingBytesIO()
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         writer = dctx.stream_writer(buffer)
 
         writer.write(foo)
@@ -150,10 +162,10 @@ class TestDecompressor_stream_writer(unittest.TestCase):
         self.assertEqual(buffer._flush_count, 0)
 
     def test_close_closefd_false(self):
-        foo = zstd.ZstdCompressor().compress(b"foo")
+        foo = self.cctx.compress(b"foo")
 
         buffer = NonClosingBytesIO()
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         writer = dctx.stream_writer(buffer, closefd=False)
 
         writer.write(foo)
@@ -201,7 +213,7 @@ class TestDecompressor_stream_writer(unittest.TestCase):
 
     def test_flush(self):
         buffer = CustomBytesIO()
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         writer = dctx.stream_writer(buffer)
 
         writer.flush()
@@ -210,24 +222,23 @@ class TestDecompressor_stream_writer(unittest.TestCase):
         self.assertEqual(buffer._flush_count, 2)
 
     def test_empty_roundtrip(self):
-        cctx = zstd.ZstdCompressor()
-        empty = cctx.compress(b"")
+        empty = self.cctx.compress(b"")
         self.assertEqual(decompress_via_writer(empty), b"")
 
     def test_input_types(self):
         cctx = zstd.ZstdCompressor(level=1)
         compressed = cctx.compress(b"foo")
 
-        mutable_array = bytearray(len(compressed))
-        mutable_array[:] = compressed
+        mutable_array = bytearray(compressed)
 
+        # Read-only view, mutable buffer and a writable view of that buffer.
         sources = [
             memoryview(compressed),
-            bytearray(compressed),
             mutable_array,
+            memoryview(mutable_array),
         ]
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         for source in sources:
             buffer = io.BytesIO()
 
@@ -248,32 +259,24 @@ class TestDecompressor_stream_writer(unittest.TestCase):
             self.assertEqual(buffer.getvalue(), b"foo")
 
     def test_large_roundtrip(self):
-        chunks = []
-        for i in range(255):
-            chunks.append(struct.Struct(">B").pack(i) * 16384)
-        orig = b"".join(chunks)
-        cctx = zstd.ZstdCompressor()
-        compressed = cctx.compress(orig)
+        orig = b"".join(bytes([i]) * 16384 for i in range(255))
+        compressed = self.cctx.compress(orig)
 
         self.assertEqual(decompress_via_writer(compressed), orig)
 
     def test_multiple_calls(self):
-        chunks = []
-        for i in range(255):
-            for j in range(255):
-                chunks.append(struct.Struct(">B").pack(j) * i)
-
-        orig = b"".join(chunks)
-        cctx = zstd.ZstdCompressor()
-        compressed = cctx.compress(orig)
+        orig = b"".join(bytes([j]) * i for i in range(255) for j in range(255))
+        compressed = self.cctx.compress(orig)
+        # Slicing a memoryview avoids copying each chunk.
+        compressed_view = memoryview(compressed)
 
         buffer = io.BytesIO()
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         with dctx.stream_writer(buffer, closefd=False) as decompressor:
             pos = 0
             while pos < len(compressed):
                 pos2 = pos + 8192
-                decompressor.write(compressed[pos:pos2])
+                decompressor.write(compressed_view[pos:pos2])
                 pos += 8192
         self.assertEqual(buffer.getvalue(), orig)
 
@@ -281,25 +284,17 @@ class TestDecompressor_stream_writer(unittest.TestCase):
         buffer = io.BytesIO()
         writer = dctx.stream_writer(buffer, write_return_read=False)
         pos = 0
-        buffer_len = len(buffer.getvalue())
+        buffer_len = buffer.tell()
         while pos < len(compressed):
             pos2 = pos + 8192
-            chunk = compressed[pos:pos2]
-            self.assertEqual(
-                writer.write(chunk), len(buffer.getvalue()) - buffer_len
-            )
-            buffer_len = len(buffer.getvalue())
+            chunk = compressed_view[pos:pos2]
+            self.assertEqual(writer.write(chunk), buffer.tell() - buffer_len)
+            buffer_len = buffer.tell()
             pos += 8192
         self.assertEqual(buffer.getvalue(), orig)
 
     def test_dictionary(self):
-        samples = []
-        for i in range(128):
-            samples.append(b"foo" * 64)
-            samples.append(b"bar" * 64)
-            samples.append(b"foobar" * 64)
-
-        d = zstd.train_dictionary(8192, samples)
+        d = self.dict_8k
 
         orig = b"foobar" * 16384
         buffer = io.BytesIO()
@@ -323,6 +318,7 @@ class TestDecompressor_stream_writer(unittest.TestCase):
         self.assertEqual(buffer.getvalue(), orig)
 
     def test_memory_size(self):
+        # A fresh decompressor so the size isn't influenced by other tests.
         dctx = zstd.ZstdDecompressor()
         buffer = io.BytesIO()
 
@@ -336,28 +332,25 @@ class TestDecompressor_stream_writer(unittest.TestCase):
         self.assertGreater(size, 100000)
 
     def test_write_size(self):
-        source = zstd.ZstdCompressor().compress(b"foobarfoobar")
+        source = self.cctx.compress(b"foobarfoobar")
         dest = CustomBytesIO()
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
         with dctx.stream_writer(
             dest, write_size=1, closefd=False
         ) as decompressor:
-            s = struct.Struct(">B")
-            for c in source:
-                if not isinstance(c, str):
-                    c = s.pack(c)
-                decompressor.write(c)
+            for i in range(len(source)):
+                decompressor.write(source[i : i + 1])
 
         self.assertEqual(dest.getvalue(), b"foobarfoobar")
         self.assertEqual(dest._write_count, len(dest.getvalue()))
 
     def test_write_exception(self):
-        frame = zstd.ZstdCompressor().compress(b"foo" * 1024)
+        frame = self.cctx.compress(b"foo" * 1024)
 
         b = CustomBytesIO()
         b.write_exception = IOError("write")
 
-        dctx = zstd.ZstdDecompressor()
+        dctx = self.dctx
 
         writer = dctx.stream_writer(b)
 
@@ -86,6 +86,7 @@ __all__ = [
 
 import io
 import os
+import threading
 
 from ._cffi import (  # type: ignore
     ffi,
@@ -748,12 +749,19 @@ class ZstdCompressionWriter(object):
         self._closing = False
         self._closed = False
         self._bytes_compressed = 0
+        # Pledged size of the current frame, if still applicable.
+        self._source_size = source_size
+        # Frame was ended by write() and not yet acknowledged by a flush.
+        self._frame_ended = False
 
         self._dst_buffer = ffi.new("char[]", write_size)
         self._out_buffer = ffi.new("ZSTD_outBuffer *")
         self._out_buffer.dst = self._dst_buffer
         self._out_buffer.size = len(self._dst_buffer)
         self._out_buffer.pos = 0
+        # Reused across write() and flush() calls so small writes don't pay
+        # for a fresh allocation. zstd buffers the input itself.
+        self._in_buffer = ffi.new("ZSTD_inBuffer *")
 
         zresult = lib.ZSTD_CCtx_setPledgedSrcSize(compressor._cctx, source_size)
         if lib.ZSTD_isError(zresult):
@@ -853,7 +861,24 @@ class ZstdCompressionWriter(object):
 
         data_buffer = ffi.from_buffer(data)
 
-        in_buffer = ffi.new("ZSTD_inBuffer *")
+        # Nothing to feed the compressor.
+        if not len(data_buffer):
+            return 0
+
+        if self._frame_ended:
+            raise ZstdError("zstd compress error: Src size is incorrect")
+
+        # If a single write provides all of the pledged input, end the frame
+        # now. This allows zstd to compress directly from the source buffer
+        # instead of staging input in its internal buffer first.
+        if self._source_size == len(data_buffer):
+            end_op = lib.ZSTD_e_end
+        else:
+            end_op = lib.ZSTD_e_continue
+
+        self._source_size = lib.ZSTD_CONTENTSIZE_UNKNOWN
+
+        in_buffer = self._in_buffer
         in_buffer.src = data_buffer
         in_buffer.size = len(data_buffer)
         in_buffer.pos = 0
@@ -861,12 +886,14 @@ class ZstdCompressionWriter(object):
         out_buffer = self._out_buffer
         out_buffer.pos = 0
 
-        while in_buffer.pos < in_buffer.size:
+        while in_buffer.pos < in_buffer.size or (
+            end_op == lib.ZSTD_e_end and not self._frame_ended
+        ):
             zresult = lib.ZSTD_compressStream2(
                 self._compressor._cctx,
                 out_buffer,
                 in_buffer,
-                lib.ZSTD_e_continue,
+                end_op,
             )
             if lib.ZSTD_isError(zresult):
                 raise ZstdError(
@@ -881,6 +908,12 @@ class ZstdCompressionWriter(object):
                 self._bytes_compressed += out_buffer.pos
                 out_buffer.pos = 0
 
+            if end_op == lib.ZSTD_e_end and not zresult:
+                self._frame_ended = True
+
+        # Don't hold on to a pointer into the caller's buffer.
+        in_buffer.src = ffi.NULL
+
         if self._write_return_read:
             return in_buffer.pos
         else:
@@ -923,12 +956,13 @@ class ZstdCompressionWriter(object):
         out_buffer = self._out_buffer
         out_buffer.pos = 0
 
-        in_buffer = ffi.new("ZSTD_inBuffer *")
+        in_buffer = self._in_buffer
         in_buffer.src = ffi.NULL
         in_buffer.size = 0
         in_buffer.pos = 0
 
-        while True:
+        # If write() already ended the frame, there is nothing to flush.
+        while not self._frame_ended:
             zresult = lib.ZSTD_compressStream2(
                 self._compressor._cctx, out_buffer, in_buffer, flush
             )
@@ -948,6 +982,11 @@ class ZstdCompressionWriter(object):
             if not zresult:
                 break
 
+        # The pledged size only applies to the first frame.
+        if flush == lib.ZSTD_e_end:
+            self._frame_ended = False
+            self._source_size = lib.ZSTD_CONTENTSIZE_UNKNOWN
+
         f = getattr(self._writer, "flush", None)
         if f and not self._closing:
             f()
@@ -1858,20 +1897,20 @@ class ZstdCompressor(object):
 
         self._cctx = cctx
         self._dict_data = dict_data
+        # Guards use of ``_cctx`` by ``compress()``, which releases the GIL.
+        self._cctx_lock = threading.Lock()
 
         # We defer setting up garbage collection until after calling
         # _setup_cctx() to ensure the memory size estimate is more accurate.
         try:
-            self._setup_cctx()
+            self._setup_cctx(self._cctx)
         finally:
             self._cctx = ffi.gc(
                 cctx, lib.ZSTD_freeCCtx, size=lib.ZSTD_sizeof_CCtx(cctx)
             )
 
-    def _setup_cctx(self):
-        zresult = lib.ZSTD_CCtx_setParametersUsingCCtxParams(
-            self._cctx, self._params
-        )
+    def _setup_cctx(self, cctx):
+        zresult = lib.ZSTD_CCtx_setParametersUsingCCtxParams(cctx, self._params)
         if lib.ZSTD_isError(zresult):
             raise ZstdError(
                 "could not set compression parameters: %s"
@@ -1882,10 +1921,10 @@ class ZstdCompressor(object):
 
         if dict_data:
             if dict_data._cdict:
-                zresult = lib.ZSTD_CCtx_refCDict(self._cctx, dict_data._cdict)
+                zresult = lib.ZSTD_CCtx_refCDict(cctx, dict_data._cdict)
             else:
                 zresult = lib.ZSTD_CCtx_loadDictionary_advanced(
-                    self._cctx,
+                    cctx,
                     dict_data.as_bytes(),
                     len(dict_data),
                     lib.ZSTD_dlm_byRef,
@@ -1926,14 +1965,33 @@ class ZstdCompressor(object):
         >>> cctx = zstandard.ZstdCompressor()
         >>> compressed = cctx.compress(b"data to compress")
         """
-        lib.ZSTD_CCtx_reset(self._cctx, lib.ZSTD_reset_session_only)
+        # If another thread is compressing with this instance, use a temporary
+        # context with identical settings instead of sharing ``_cctx``.
+        if self._cctx_lock.acquire(False):
+            cctx = self._cctx
+        else:
+            cctx = lib.ZSTD_createCCtx()
+            if cctx == ffi.NULL:
+                raise MemoryError()
+
+            cctx = ffi.gc(cctx, lib.ZSTD_freeCCtx)
+            self._setup_cctx(cctx)
+
+        try:
+            return self._compress(cctx, data)
+        finally:
+            if cctx == self._cctx:
+                self._cctx_lock.release()
+
+    def _compress(self, cctx, data):
+        lib.ZSTD_CCtx_reset(cctx, lib.ZSTD_reset_session_only)
 
         data_buffer = ffi.from_buffer(data)
 
         dest_size = lib.ZSTD_compressBound(len(data_buffer))
         out = new_nonzero("char[]", dest_size)
 
-        zresult = lib.ZSTD_CCtx_setPledgedSrcSize(self._cctx, len(data_buffer))
+        zresult = lib.ZSTD_CCtx_setPledgedSrcSize(cctx, len(data_buffer))
         if lib.ZSTD_isError(zresult):
             raise ZstdError(
                 "error setting source size: %s" % _zstd_error(zresult)
@@ -1951,7 +2009,7 @@ class ZstdCompressor(object):
         in_buffer.pos = 0
 
         zresult = lib.ZSTD_compressStream2(
-            self._cctx, out_buffer, in_buffer, lib.ZSTD_e_end
+            cctx, out_buffer, in_buffer, lib.ZSTD_e_end
         )
 
         if lib.ZSTD_isError(zresult):
@@ -2221,7 +2279,9 @@ class ZstdCompressor(object):
            to influence compression parameter tuning and could result in the
            size being written into the header of the compressed data.
         :param write_size:
-           How much data to ``write()`` to ``writer`` at a time.
+           How much data to ``write()`` to ``writer`` at a time. If ``size``
+           is set, this is capped at the maximum compressed size of that
+           many bytes.
         :param write_return_read:
            Whether ``write()`` should return the number of bytes that were
            consumed from the input.
@@ -2237,6 +2297,9 @@ class ZstdCompressor(object):
 
         if size < 0:
             size = lib.ZSTD_CONTENTSIZE_UNKNOWN
+        elif size < write_size:
+            # The output can never exceed the compression bound of the input.
+            write_size = min(write_size, lib.ZSTD_compressBound(size))
 
         return ZstdCompressionWriter(
             self, writer, size, write_size, write_return_read, closefd=closefd